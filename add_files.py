@@ -1,49 +1,61 @@
 #!/usr/bin/env python3
+import binascii
+import os
+import re
 import sys
-import uuid
 
-def generate_uuid():
-    return str(uuid.uuid4()).replace('-', '').upper()[:24]
+def generate_uuids(count):
+    # Xcode object IDs are 24 hex chars (12 random bytes); draw them all at once
+    raw = binascii.hexlify(os.urandom(12 * count)).upper().decode()
+    return [raw[i * 24:(i + 1) * 24] for i in range(count)]
 
-# Read the project file
-project_file = "/Users/nick/UFC Scraper/UFC_Events_iOS/UFC_Events_iOS.xcodeproj/project.pbxproj"
+# Existing pbxproj text that each edit anchors on
+BUILD_FILE_SECTION = "/* Begin PBXBuildFile section */"
+FILE_REF_SECTION = "/* Begin PBXFileReference section */"
 
-with open(project_file, 'r') as f:
-    content = f.read()
+OLD_GROUP_CHILDREN = """\t\t\tchildren = (
+\t\t\t\t01279D432E17BA4800521A68 /* UFC_Events_iOSApp.swift */,
+\t\t\t\t013665E32E1873F8005B4EFA /* EventCardView.swift */,
+\t\t\t\t013665E12E1873F8005B4EFA /* FightSegmentView.swift */,
+\t\t\t\t013665E22E1873F8005B4EFA /* FilterView.swift */,
+\t\t\t\t013665E02E1873F8005B4EFA /* UFCEvent.swift */,
+\t\t\t\t01279D472E17BA4900521A68 /* Assets.xcassets */,
+\t\t\t\t01279D492E17BA4900521A68 /* Preview Content */,"""
 
-# Generate UUIDs for the new files
-content_view_uuid = generate_uuid()
-event_list_view_uuid = generate_uuid()
-event_detail_view_uuid = generate_uuid()
-sample_data_uuid = generate_uuid()
+OLD_SOURCES_FILES = """\t\t\tfiles = (
+\t\t\t\t013665E62E1873F8005B4EFA /* FilterView.swift in Sources */,
+\t\t\t\t01279D442E17BA4800521A68 /* UFC_Events_iOSApp.swift in Sources */,
+\t\t\t\t013665E52E1873F8005B4EFA /* FightSegmentView.swift in Sources */,
+\t\t\t\t013665E42E1873F8005B4EFA /* UFCEvent.swift in Sources */,
+\t\t\t\t013665E72E1873F8005B4EFA /* EventCardView.swift in Sources */,"""
 
-content_view_build_uuid = generate_uuid()
-event_list_view_build_uuid = generate_uuid()
-event_detail_view_build_uuid = generate_uuid()
-sample_data_build_uuid = generate_uuid()
+OLD_RESOURCES_FILES = """\t\t\tfiles = (
+\t\t\t\t01279D4B2E17BA4900521A68 /* Preview Assets.xcassets in Resources */,
+\t\t\t\t01279D482E17BA4900521A68 /* Assets.xcassets in Resources */,"""
 
-# Add PBXBuildFile entries
-build_file_section = "/* Begin PBXBuildFile section */"
-new_build_files = f"""{build_file_section}
+# Compiled once so every marker is found in a single scan of the file
+PBXPROJ_MARKERS = re.compile("|".join(map(re.escape, [
+    BUILD_FILE_SECTION,
+    FILE_REF_SECTION,
+    OLD_GROUP_CHILDREN,
+    OLD_SOURCES_FILES,
+    OLD_RESOURCES_FILES,
+])))
+
+# Replacement text for each anchor, filled in with the generated IDs
+NEW_BUILD_FILES = BUILD_FILE_SECTION + """
 \t\t{content_view_build_uuid} /* ContentView.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {content_view_uuid} /* ContentView.swift */; }};
 \t\t{event_list_view_build_uuid} /* EventListView.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {event_list_view_uuid} /* EventListView.swift */; }};
 \t\t{event_detail_view_build_uuid} /* EventDetailView.swift in Sources */ = {{isa = PBXBuildFile; fileRef = {event_detail_view_uuid} /* EventDetailView.swift */; }};
 \t\t{sample_data_build_uuid} /* UFC_SampleData.json in Resources */ = {{isa = PBXBuildFile; fileRef = {sample_data_uuid} /* UFC_SampleData.json */; }};"""
 
-content = content.replace(build_file_section, new_build_files)
-
-# Add PBXFileReference entries
-file_ref_section = "/* Begin PBXFileReference section */"
-new_file_refs = f"""{file_ref_section}
+NEW_FILE_REFS = FILE_REF_SECTION + """
 \t\t{content_view_uuid} /* ContentView.swift */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = sourcecode.swift; path = ContentView.swift; sourceTree = "<group>"; }};
 \t\t{event_list_view_uuid} /* EventListView.swift */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = sourcecode.swift; path = EventListView.swift; sourceTree = "<group>"; }};
 \t\t{event_detail_view_uuid} /* EventDetailView.swift */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = sourcecode.swift; path = EventDetailView.swift; sourceTree = "<group>"; }};
 \t\t{sample_data_uuid} /* UFC_SampleData.json */ = {{isa = PBXFileReference; fileEncoding = 4; lastKnownFileType = text.json; path = UFC_SampleData.json; sourceTree = "<group>"; }};"""
 
-content = content.replace(file_ref_section, new_file_refs)
-
-# Add to UFC_Events_iOS group
-group_children = """\t\t\t\tchildren = (
+NEW_GROUP_CHILDREN = """\t\t\t\tchildren = (
 \t\t\t\t\t01279D432E17BA4800521A68 /* UFC_Events_iOSApp.swift */,
 \t\t\t\t\t{content_view_uuid} /* ContentView.swift */,
 \t\t\t\t\t{event_list_view_uuid} /* EventListView.swift */,
@@ -54,26 +66,9 @@ group_children = """\t\t\t\tchildren = (
 \t\t\t\t\t013665E02E1873F8005B4EFA /* UFCEvent.swift */,
 \t\t\t\t\t01279D472E17BA4900521A68 /* Assets.xcassets */,
 \t\t\t\t\t01279D492E17BA4900521A68 /* Preview Content */,
-\t\t\t\t\t{sample_data_uuid} /* UFC_SampleData.json */,""".format(
-    content_view_uuid=content_view_uuid,
-    event_list_view_uuid=event_list_view_uuid,
-    event_detail_view_uuid=event_detail_view_uuid,
-    sample_data_uuid=sample_data_uuid
-)
-
-old_group_children = """\t\t\tchildren = (
-\t\t\t\t01279D432E17BA4800521A68 /* UFC_Events_iOSApp.swift */,
-\t\t\t\t013665E32E1873F8005B4EFA /* EventCardView.swift */,
-\t\t\t\t013665E12E1873F8005B4EFA /* FightSegmentView.swift */,
-\t\t\t\t013665E22E1873F8005B4EFA /* FilterView.swift */,
-\t\t\t\t013665E02E1873F8005B4EFA /* UFCEvent.swift */,
-\t\t\t\t01279D472E17BA4900521A68 /* Assets.xcassets */,
-\t\t\t\t01279D492E17BA4900521A68 /* Preview Content */,"""
+\t\t\t\t\t{sample_data_uuid} /* UFC_SampleData.json */,"""
 
-content = content.replace(old_group_children, group_children)
-
-# Add to Sources build phase
-sources_files = f"""\t\t\tfiles = (
+NEW_SOURCES_FILES = """\t\t\tfiles = (
 \t\t\t\t013665E62E1873F8005B4EFA /* FilterView.swift in Sources */,
 \t\t\t\t01279D442E17BA4800521A68 /* UFC_Events_iOSApp.swift in Sources */,
 \t\t\t\t{content_view_build_uuid} /* ContentView.swift in Sources */,
@@ -83,34 +78,70 @@ sources_files = f"""\t\t\tfiles = (
 \t\t\t\t013665E42E1873F8005B4EFA /* UFCEvent.swift in Sources */,
 \t\t\t\t013665E72E1873F8005B4EFA /* EventCardView.swift in Sources */,"""
 
-old_sources_files = """\t\t\tfiles = (
-\t\t\t\t013665E62E1873F8005B4EFA /* FilterView.swift in Sources */,
-\t\t\t\t01279D442E17BA4800521A68 /* UFC_Events_iOSApp.swift in Sources */,
-\t\t\t\t013665E52E1873F8005B4EFA /* FightSegmentView.swift in Sources */,
-\t\t\t\t013665E42E1873F8005B4EFA /* UFCEvent.swift in Sources */,
-\t\t\t\t013665E72E1873F8005B4EFA /* EventCardView.swift in Sources */,"""
-
-content = content.replace(old_sources_files, sources_files)
-
-# Add to Resources build phase
-resources_files = f"""\t\t\tfiles = (
+NEW_RESOURCES_FILES = """\t\t\tfiles = (
 \t\t\t\t01279D4B2E17BA4900521A68 /* Preview Assets.xcassets in Resources */,
 \t\t\t\t01279D482E17BA4900521A68 /* Assets.xcassets in Resources */,
 \t\t\t\t{sample_data_build_uuid} /* UFC_SampleData.json in Resources */,"""
 
-old_resources_files = """\t\t\tfiles = (
-\t\t\t\t01279D4B2E17BA4900521A68 /* Preview Assets.xcassets in Resources */,
-\t\t\t\t01279D482E17BA4900521A68 /* Assets.xcassets in Resources */,"""
-
-content = content.replace(old_resources_files, resources_files)
-
-# Write the updated project file
-with open(project_file, 'w') as f:
-    f.write(content)
-
-print("Successfully added missing files to Xcode project!")
-print("Files added:")
-print("- ContentView.swift")
-print("- EventListView.swift") 
-print("- EventDetailView.swift")
-print("- UFC_SampleData.json")
\ No newline at end of file
+# Names of the generated object IDs used by the templates above
+ID_NAMES = [
+    'content_view_uuid',
+    'event_list_view_uuid',
+    'event_detail_view_uuid',
+    'sample_data_uuid',
+    'content_view_build_uuid',
+    'event_list_view_build_uuid',
+    'event_detail_view_build_uuid',
+    'sample_data_build_uuid',
+]
+
+ADDED_FILES = [
+    'ContentView.swift',
+    'EventListView.swift',
+    'EventDetailView.swift',
+    'UFC_SampleData.json',
+]
+
+PROJECT_FILE = "/Users/nick/UFC Scraper/UFC_Events_iOS/UFC_Events_iOS.xcodeproj/project.pbxproj"
+
+
+def main():
+    # Read the project file
+    with open(PROJECT_FILE, 'r') as f:
+        content = f.read()
+    
+    # Re-runs are a no-op once every file reference is present
+    if all(f"path = {name};" in content for name in ADDED_FILES):
+        print("Xcode project already up to date")
+        return
+    
+    # Generate UUIDs for the new files
+    ids = dict(zip(ID_NAMES, generate_uuids(len(ID_NAMES))))
+    
+    # Apply all edits in a single pass over the file, streaming the unchanged spans
+    # and the spliced-in text straight to disk rather than building a new copy
+    replacements = {
+        BUILD_FILE_SECTION: NEW_BUILD_FILES.format(**ids),
+        FILE_REF_SECTION: NEW_FILE_REFS.format(**ids),
+        OLD_GROUP_CHILDREN: NEW_GROUP_CHILDREN.format(**ids),
+        OLD_SOURCES_FILES: NEW_SOURCES_FILES.format(**ids),
+        OLD_RESOURCES_FILES: NEW_RESOURCES_FILES.format(**ids),
+    }
+    
+    # Write the updated project file
+    with open(PROJECT_FILE, 'w') as f:
+        pos = 0
+        for match in PBXPROJ_MARKERS.finditer(content):
+            f.write(content[pos:match.start()])
+            f.write(replacements[match.group(0)])
+            pos = match.end()
+        f.write(content[pos:])
+    
+    print("Successfully added missing files to Xcode project!")
+    print("Files added:")
+    for name in ADDED_FILES:
+        print(f"- {name}")
+
+
+if __name__ == "__main__":
+    main()
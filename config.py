@@ -4,6 +4,37 @@ Configuration settings for UFC Scraper
 
 import os
 from pathlib import Path
+from typing import Final
+
+import orjson
+
+
+# Fixed constants, importable directly by hot paths (e.g. per-request headers)
+MAX_RATE_LIMIT: Final = 5.0      # maximum allowed rate
+MIN_RATE_LIMIT: Final = 0.1      # minimum allowed rate
+
+USER_AGENT: Final = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+UFCSTATS_BASE_URL: Final = "http://ufcstats.com"
+UFCSTATS_EVENTS_URL: Final = f"{UFCSTATS_BASE_URL}/statistics/events/completed"
+
+UFC_OFFICIAL_BASE_URL: Final = "https://www.ufc.com"
+UFC_OFFICIAL_API_URL: Final = f"{UFC_OFFICIAL_BASE_URL}/api/v3/events"
+
+ESPN_MMA_BASE_URL: Final = "https://site.web.api.espn.com/apis/v2/sports/mma/ufc"
+ESPN_MMA_EVENTS_URL: Final = f"{ESPN_MMA_BASE_URL}/events"
+
+BEST_FIGHT_ODDS_BASE_URL: Final = "https://www.bestfightodds.com"
+
+# HTTP response cache: finished events do not change, upcoming ones do
+HTTP_CACHE_FILENAME: Final = ".http_cache.db"
+HTTP_CACHE_TTL_HISTORICAL: Final = 30 * 24 * 3600  # seconds
+HTTP_CACHE_TTL_FUTURE: Final = 3600                # seconds
+HTTP_CACHE_SETTLE_DAYS: Final = 2                  # days after an event before its pages count as final
+
+# Parsed fighters cache; kept beside the HTTP cache and deliberately not *.json, so
+# loaders that read every *.json in the data directory as an event skip it
+FIGHTERS_CACHE_FILENAME: Final = ".fighters_cache"
 
 
 class Config:
@@ -11,8 +42,8 @@ class Config:
     
     # Rate limiting
     DEFAULT_RATE_LIMIT = 2.0  # requests per second
-    MAX_RATE_LIMIT = 5.0      # maximum allowed rate
-    MIN_RATE_LIMIT = 0.1      # minimum allowed rate
+    MAX_RATE_LIMIT = MAX_RATE_LIMIT
+    MIN_RATE_LIMIT = MIN_RATE_LIMIT
     
     # Retry settings
     MAX_RETRIES = 3
@@ -22,7 +53,7 @@ class Config:
     
     # Request settings
     REQUEST_TIMEOUT = 30
-    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    USER_AGENT = USER_AGENT
     
     # Database settings
     DEFAULT_DB_PATH = "ufc_data.db"
@@ -30,20 +61,22 @@ class Config:
     
     # Output settings
     DEFAULT_OUTPUT_DIR = "data"
+    # Deprecated: JSON output goes through dump_json(), which always writes
+    # 2-space indented UTF-8
     JSON_INDENT = 2
     JSON_ENSURE_ASCII = False
     
     # Scraper URLs
-    UFCSTATS_BASE_URL = "http://ufcstats.com"
-    UFCSTATS_EVENTS_URL = f"{UFCSTATS_BASE_URL}/statistics/events/completed"
+    UFCSTATS_BASE_URL = UFCSTATS_BASE_URL
+    UFCSTATS_EVENTS_URL = UFCSTATS_EVENTS_URL
     
-    UFC_OFFICIAL_BASE_URL = "https://www.ufc.com"
-    UFC_OFFICIAL_API_URL = f"{UFC_OFFICIAL_BASE_URL}/api/v3/events"
+    UFC_OFFICIAL_BASE_URL = UFC_OFFICIAL_BASE_URL
+    UFC_OFFICIAL_API_URL = UFC_OFFICIAL_API_URL
     
-    ESPN_MMA_BASE_URL = "https://site.web.api.espn.com/apis/v2/sports/mma/ufc"
-    ESPN_MMA_EVENTS_URL = f"{ESPN_MMA_BASE_URL}/events"
+    ESPN_MMA_BASE_URL = ESPN_MMA_BASE_URL
+    ESPN_MMA_EVENTS_URL = ESPN_MMA_EVENTS_URL
     
-    BEST_FIGHT_ODDS_BASE_URL = "https://www.bestfightodds.com"
+    BEST_FIGHT_ODDS_BASE_URL = BEST_FIGHT_ODDS_BASE_URL
     
     # Date formats
     DATE_FORMAT = "%Y-%m-%d"
@@ -67,22 +100,27 @@ class Config:
     def from_env(cls):
         """Load configuration from environment variables"""
         config = cls()
+        env = os.environ
         
         # Rate limiting
-        if os.getenv('UFC_SCRAPER_RATE_LIMIT'):
-            config.DEFAULT_RATE_LIMIT = float(os.getenv('UFC_SCRAPER_RATE_LIMIT'))
+        rate_limit = env.get('UFC_SCRAPER_RATE_LIMIT')
+        if rate_limit:
+            config.DEFAULT_RATE_LIMIT = float(rate_limit)
         
         # Database
-        if os.getenv('UFC_SCRAPER_DB_PATH'):
-            config.DEFAULT_DB_PATH = os.getenv('UFC_SCRAPER_DB_PATH')
+        db_path = env.get('UFC_SCRAPER_DB_PATH')
+        if db_path:
+            config.DEFAULT_DB_PATH = db_path
         
         # Output directory
-        if os.getenv('UFC_SCRAPER_OUTPUT_DIR'):
-            config.DEFAULT_OUTPUT_DIR = os.getenv('UFC_SCRAPER_OUTPUT_DIR')
+        output_dir = env.get('UFC_SCRAPER_OUTPUT_DIR')
+        if output_dir:
+            config.DEFAULT_OUTPUT_DIR = output_dir
         
         # Logging
-        if os.getenv('UFC_SCRAPER_LOG_LEVEL'):
-            config.LOG_LEVEL = os.getenv('UFC_SCRAPER_LOG_LEVEL')
+        log_level = env.get('UFC_SCRAPER_LOG_LEVEL')
+        if log_level:
+            config.LOG_LEVEL = log_level
         
         return config
     
@@ -97,13 +135,21 @@ class Config:
         if self.REQUEST_TIMEOUT < 1:
             raise ValueError("REQUEST_TIMEOUT must be at least 1 second")
         
-        # Ensure output directory exists
-        Path(self.DEFAULT_OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+        # Ensure output directory exists (a single stat in the common case)
+        output_dir = Path(self.DEFAULT_OUTPUT_DIR)
+        if not output_dir.is_dir():
+            output_dir.mkdir(parents=True, exist_ok=True)
     
     def __repr__(self):
         return f"Config(rate_limit={self.DEFAULT_RATE_LIMIT}, db_path='{self.DEFAULT_DB_PATH}')"
 
 
+def dump_json(obj, path):
+    """Write obj to path as 2-space indented UTF-8 JSON"""
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+
 # Global configuration instance
 config = Config.from_env()
 config.validate()
\ No newline at end of file
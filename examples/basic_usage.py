@@ -4,18 +4,25 @@ Basic usage examples for UFC Scraper
 """
 
 import asyncio
-import json
+import mmap
+import os
+from collections import Counter
 from pathlib import Path
 import sys
 
-# Add parent directory to path to import modules
-sys.path.append(str(Path(__file__).parent.parent))
+import orjson
+
+# Add parent directory to path to import modules (once, ahead of site-packages)
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 from scrapers.ufc_stats import UFCStatsScaper
 from scrapers.ufc_official import UFCOfficialScraper
 from scrapers.espn_mma import ESPNMMAScraper
 from utils.rate_limiter import RateLimiter
 from utils.database import DatabaseManager
+from models.ufc_models import TITLE_NONE
 
 
 async def example_basic_scraping():
@@ -48,6 +55,8 @@ async def example_basic_scraping():
             if event_data.fights:
                 main_event = event_data.fights[0]  # bout_order 1
                 print(f"Main Event: {main_event.fighter1.name} vs {main_event.fighter2.name}")
+    
+    await ufc_stats.close()
 
 
 async def example_database_usage():
@@ -119,6 +128,9 @@ async def example_multiple_sources():
     ]
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
+    await ufc_stats.close()
+    await ufc_official.close()
+    await espn_mma.close()
     
     all_events = []
     for i, result in enumerate(results):
@@ -131,12 +143,14 @@ async def example_multiple_sources():
     
     print(f"Total events discovered: {len(all_events)}")
     
-    # Deduplicate events (simple example)
-    unique_events = {}
+    # Deduplicate events (simple example) - the set holds only the small keys
+    seen = set()
+    unique_events = []
     for event in all_events:
-        key = (event.get('date'), event.get('name', '').lower())
-        if key not in unique_events:
-            unique_events[key] = event
+        key = (event.get('date'), (event.get('name') or '').casefold())
+        if key not in seen:
+            seen.add(key)
+            unique_events.append(event)
     
     print(f"Unique events after deduplication: {len(unique_events)}")
 
@@ -151,7 +165,9 @@ def example_data_analysis():
         print("No data directory found. Run scraper first.")
         return
     
-    json_files = list(data_dir.glob("*.json"))
+    # Skip empty files up front: mmap cannot map a zero-length file
+    json_files = [entry.path for entry in os.scandir(data_dir)
+                  if entry.is_file() and entry.name.endswith('.json') and entry.stat().st_size]
     if not json_files:
         print("No JSON files found. Run scraper first.")
         return
@@ -160,30 +176,26 @@ def example_data_analysis():
     
     # Analyze events
     total_fights = 0
-    weight_classes = {}
+    weight_classes = Counter()
     title_fights = 0
     
     for json_file in json_files:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            event_data = json.load(f)
+        with open(json_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            event_data = orjson.loads(memoryview(m))
         
-        fights = event_data.get('fights', [])
+        fights = event_data.get('fights', ())
         total_fights += len(fights)
         
-        for fight in fights:
-            # Count weight classes
-            weight_class = fight.get('weight_class', 'Unknown')
-            weight_classes[weight_class] = weight_classes.get(weight_class, 0) + 1
-            
-            # Count title fights
-            if fight.get('title_fight') != 'none':
-                title_fights += 1
+        # Count weight classes and title fights (Counter.update tallies in C, so this
+        # stays one bulk pass per event without pulling in numpy)
+        weight_classes.update(fight.get('weight_class', 'Unknown') for fight in fights)
+        title_fights += sum(1 for fight in fights if fight.get('title_fight') != TITLE_NONE)
     
     print(f"Total fights analyzed: {total_fights}")
     print(f"Title fights: {title_fights}")
     print(f"Most common weight classes:")
     
-    for weight_class, count in sorted(weight_classes.items(), key=lambda x: x[1], reverse=True)[:5]:
+    for weight_class, count in weight_classes.most_common(5):
         print(f"  {weight_class}: {count} fights")
 
 
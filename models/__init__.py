@@ -9,6 +9,8 @@ from .ufc_models import (
     FightStats,
     EventStatus,
     TitleFightType,
+    TITLE_NONE,
+    event_dedup_key,
     FightResult,
     ScrapingResult
 )
@@ -20,6 +22,8 @@ __all__ = [
     'FightStats',
     'EventStatus',
     'TitleFightType',
+    'TITLE_NONE',
+    'event_dedup_key',
     'FightResult',
     'ScrapingResult'
 ]
\ No newline at end of file
@@ -2,9 +2,10 @@
 Pydantic models for UFC event and fight data
 """
 
+import sys
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 
@@ -23,6 +24,16 @@ class TitleFightType(str, Enum):
     NONE = "none"
 
 
+# Plain-str value for hot loops over raw JSON dicts (avoids enum attribute lookups)
+TITLE_NONE = TitleFightType.NONE.value
+
+
+def event_dedup_key(event_date: str, event_name: str) -> Tuple[str, str]:
+    """Canonical (date, name) key for spotting the same event across sources"""
+    # Interned, so the same event seen by several sources compares by identity
+    return (sys.intern(event_date), sys.intern(event_name.casefold().strip()))
+
+
 class FightResult(str, Enum):
     """Fight result enumeration"""
     WIN = "win"
@@ -33,6 +44,9 @@ class FightResult(str, Enum):
 
 class FighterRecord(BaseModel):
     """Fighter's MMA record breakdown"""
+    __slots__ = ()
+    model_config = ConfigDict(frozen=True)
+    
     wins: Optional[int] = Field(None, ge=0, description="Total wins")
     losses: Optional[int] = Field(None, ge=0, description="Total losses") 
     draws: Optional[int] = Field(None, ge=0, description="Total draws")
@@ -57,6 +71,9 @@ class FighterRecord(BaseModel):
 
 class Fighter(BaseModel):
     """Individual fighter model"""
+    # Pydantic keeps field values in __dict__; empty slots just drop the per-instance __weakref__
+    __slots__ = ()
+    
     name: str = Field(..., min_length=1, description="Fighter's full name")
     record: Optional[str] = Field(None, description="Win-Loss-Draw record (e.g., '22-2-0')")
     record_breakdown: Optional[FighterRecord] = Field(None, description="Detailed record breakdown")
@@ -71,20 +88,13 @@ class Fighter(BaseModel):
     bonus: Optional[str] = Field(None, description="Performance bonus (e.g., 'Fight of the Night')")
     is_champion: bool = Field(False, description="Whether this fighter is defending a championship title")
     wikipedia_url: Optional[str] = Field(None, description="Fighter's Wikipedia page URL")
-    
-    @validator('record')
-    def validate_record(cls, v):
-        if v and not v.replace('-', '').replace('(', '').replace(')', '').replace(' ', '').replace('NC', '').isdigit():
-            # Allow format like "22-2-0", "22-2-0 (1 NC)", etc.
-            pass
-        return v
-
-
-
 
 
 class FightStats(BaseModel):
     """Detailed fight statistics"""
+    __slots__ = ()
+    model_config = ConfigDict(frozen=True)
+    
     total_strikes_f1: Optional[int] = Field(None, ge=0)
     total_strikes_f2: Optional[int] = Field(None, ge=0)
     significant_strikes_f1: Optional[int] = Field(None, ge=0)
@@ -99,6 +109,8 @@ class FightStats(BaseModel):
 
 class Fight(BaseModel):
     """Individual fight/bout model"""
+    __slots__ = ()
+    
     bout_order: int = Field(..., ge=1, description="Fight order on card (1=main event)")
     fighter1: Fighter = Field(..., description="First fighter")
     fighter2: Fighter = Field(..., description="Second fighter")
@@ -121,7 +133,8 @@ class Fight(BaseModel):
     fight_url: Optional[str] = Field(None, description="Source URL for fight details")
     segment: Optional[str] = Field(None, description="Broadcast segment (main-card, prelims, early-prelims)")
     
-    @validator('bout_order')
+    @field_validator('bout_order')
+    @classmethod
     def validate_bout_order(cls, v):
         if v < 1:
             raise ValueError('bout_order must be at least 1')
@@ -153,7 +166,8 @@ class UFCEvent(BaseModel):
     scraped_at: datetime = Field(default_factory=datetime.now, description="Scrape timestamp")
     source_urls: Dict[str, str] = Field(default_factory=dict, description="Source URLs by scraper")
     
-    @validator('event_date')
+    @field_validator('event_date')
+    @classmethod
     def validate_event_date(cls, v):
         try:
             datetime.strptime(v, '%Y-%m-%d')
@@ -161,18 +175,15 @@ class UFCEvent(BaseModel):
             raise ValueError('event_date must be in YYYY-MM-DD format')
         return v
     
-    @validator('fights')
+    @field_validator('fights')
+    @classmethod
     def validate_fights_order(cls, v):
-        if v:
-            bout_orders = [fight.bout_order for fight in v]
-            if len(bout_orders) != len(set(bout_orders)):
+        seen = set()
+        for fight in v:
+            if fight.bout_order in seen:
                 raise ValueError('All fights must have unique bout_order values')
+            seen.add(fight.bout_order)
         return v
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ScrapingResult(BaseModel):
@@ -182,8 +193,3 @@ class ScrapingResult(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Error messages")
     scraped_at: datetime = Field(default_factory=datetime.now, description="Scrape timestamp")
     source: str = Field(..., description="Scraper source")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
@@ -3,6 +3,7 @@
 Easy setup and run script for UFC Dashboard
 """
 
+import socket
 import subprocess
 import sys
 import webbrowser
@@ -38,7 +39,7 @@ def run_scraper_sample():
             "--mode", "historical", 
             "--since", "2024-01-01",
             "--rate-limit", "1.0"
-        ], capture_output=True, text=True, timeout=60)
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60)
         
         if result.returncode == 0:
             print("✅ Sample data collected successfully")
@@ -66,10 +67,25 @@ def start_server():
         print(f"❌ Error starting server: {e}")
 
 
+def wait_for_server(host="127.0.0.1", port=8000, timeout=10.0, interval=0.05):
+    """Poll until the server accepts connections or the timeout elapses"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return True
+        time.sleep(interval)
+    return False
+
+
 def open_browser():
     """Open the dashboard in the default browser"""
     print("🌐 Opening dashboard in browser...")
-    time.sleep(2)  # Give server time to start
+    # Open as soon as the server is listening
+    if not wait_for_server():
+        print("❌ Dashboard server did not start listening on port 8000")
+        print("Check the server output above, then open http://localhost:8000 manually")
+        return
     
     try:
         webbrowser.open("http://localhost:8000")
@@ -4,10 +4,12 @@ Script to scrape the 30 most recent UFC events
 """
 
 import asyncio
-import subprocess
+import os
 import sys
 from pathlib import Path
 
+import scrape_ufc
+
 # List of 30 most recent events based on file modification times
 RECENT_EVENTS = [
     "UFC on ESPN: Lewis vs. Teixeira",
@@ -42,47 +44,69 @@ RECENT_EVENTS = [
     "UFC Fight Night: Hernandez vs. Pereira"
 ]
 
-async def scrape_event(event_id):
+# Maximum number of event scrapes in flight at once
+MAX_CONCURRENT_SCRAPES = 6
+
+# Requests per second for the shared scraper
+RATE_LIMIT = 1.0
+
+DATA_DIR = Path(__file__).parent / "data"
+
+def pending_events(event_ids, data_dir):
+    """Return unique event IDs, in order, that have no saved JSON file yet"""
+    # Saved files are named <event_id>.json, so one directory scan covers every lookup
+    existing = frozenset(
+        entry.name[:-len(".json")] for entry in os.scandir(data_dir)
+        if entry.name.endswith(".json")
+    ) if data_dir.is_dir() else frozenset()
+    return [event_id for event_id in dict.fromkeys(event_ids) if event_id not in existing]
+
+async def scrape_event(event_id, scraper, semaphore):
     """Scrape a single event"""
-    try:
-        print(f"Scraping: {event_id}")
-        result = subprocess.run([
-            sys.executable, "scrape_ufc.py", 
-            "--event-id", event_id,
-            "--rate-limit", "1.0"
-        ], capture_output=True, text=True, cwd=Path(__file__).parent)
-        
-        if result.returncode == 0:
-            print(f"✓ Successfully scraped: {event_id}")
-            return True
-        else:
-            print(f"✗ Failed to scrape: {event_id}")
-            print(f"Error: {result.stderr}")
+    async with semaphore:
+        try:
+            print(f"Scraping: {event_id}")
+            events = await scrape_ufc.run(event_id, RATE_LIMIT, scraper=scraper)
+            
+            if events:
+                print(f"✓ Successfully scraped: {event_id}")
+                return True
+            else:
+                print(f"✗ Failed to scrape: {event_id}")
+                return False
+        except Exception as e:
+            print(f"✗ Exception scraping {event_id}: {e}")
             return False
-    except Exception as e:
-        print(f"✗ Exception scraping {event_id}: {e}")
-        return False
 
-async def main():
+async def main(force=False):
     """Main scraping function"""
-    print(f"Starting to scrape {len(RECENT_EVENTS)} recent UFC events...")
+    unique_ids = list(dict.fromkeys(RECENT_EVENTS))
+    event_ids = unique_ids if force else pending_events(unique_ids, DATA_DIR)
+    skipped = len(unique_ids) - len(event_ids)
+    if skipped:
+        print(f"Skipping {skipped} events already saved in {DATA_DIR} (use --force to re-scrape)")
     
-    successful = 0
-    failed = 0
+    print(f"Starting to scrape {len(event_ids)} recent UFC events...")
+    
+    # One scraper for the whole batch, so its rate limiter, HTTP sessions and
+    # fighter database are set up once instead of once per event
+    scraper = scrape_ufc.UFCScraper(rate_limit=RATE_LIMIT, output_dir=str(DATA_DIR))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    try:
+        # Load (or build) the fighter database before the scrapes fan out, so the
+        # concurrent events all find it ready instead of racing to build it
+        if event_ids:
+            await scraper.wikipedia._load_fighter_database()
+        results = await asyncio.gather(*(scrape_event(event_id, scraper, semaphore) for event_id in event_ids))
+    finally:
+        await scraper.close()
     
-    for event_id in RECENT_EVENTS:
-        success = await scrape_event(event_id)
-        if success:
-            successful += 1
-        else:
-            failed += 1
-        
-        # Add a small delay between requests
-        await asyncio.sleep(1)
+    successful = sum(results)
+    failed = len(results) - successful
     
     print(f"\nScraping complete!")
     print(f"✓ Successfully scraped: {successful} events")
     print(f"✗ Failed to scrape: {failed} events")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(force="--force" in sys.argv[1:]))
\ No newline at end of file
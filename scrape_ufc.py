@@ -7,9 +7,9 @@ Supports both historical and upcoming events with rich fight details.
 """
 
 import asyncio
-import json
 import logging
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
@@ -18,9 +18,11 @@ from scrapers.ufc_stats import UFCStatsScaper
 from scrapers.ufc_official import UFCOfficialScraper
 from scrapers.espn_mma import ESPNMMAScraper
 from scrapers.wikipedia_ufc import WikipediaUFCScraper
-from models.ufc_models import UFCEvent, Fight
+from models.ufc_models import UFCEvent, Fight, event_dedup_key
 from utils.database import DatabaseManager
 from utils.rate_limiter import RateLimiter
+from utils.http_cache import HttpCache
+from config import dump_json, HTTP_CACHE_FILENAME
 
 # Configure logging
 logging.basicConfig(
@@ -33,16 +35,20 @@ logger = logging.getLogger(__name__)
 class UFCScraper:
     """Main UFC scraper orchestrator"""
     
-    def __init__(self, rate_limit: float = 2.0, output_dir: str = "data"):
+    def __init__(self, rate_limit: float = 2.0, output_dir: str = "data",
+                 max_concurrent_events: int = 10):
         self.rate_limiter = RateLimiter(rate_limit)
+        # Caps events in flight; the shared rate limiter still paces the requests
+        self._event_sem = asyncio.BoundedSemaphore(max_concurrent_events)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
         # Initialize scrapers
-        self.ufc_stats = UFCStatsScaper(self.rate_limiter)
-        self.ufc_official = UFCOfficialScraper(self.rate_limiter)
-        self.espn_mma = ESPNMMAScraper(self.rate_limiter)
-        self.wikipedia = WikipediaUFCScraper(self.rate_limiter)
+        self.http_cache = HttpCache(self.output_dir / HTTP_CACHE_FILENAME)
+        self.ufc_stats = UFCStatsScaper(self.rate_limiter, self.http_cache)
+        self.ufc_official = UFCOfficialScraper(self.rate_limiter, self.http_cache)
+        self.espn_mma = ESPNMMAScraper(self.rate_limiter, self.http_cache)
+        self.wikipedia = WikipediaUFCScraper(self.rate_limiter, self.output_dir)
         
         self.db_manager = None
     
@@ -51,6 +57,13 @@ class UFCScraper:
         self.db_manager = DatabaseManager(db_path)
         self.db_manager.create_tables()
     
+    async def close(self):
+        """Close the HTTP sessions held by the async scrapers and the HTTP cache"""
+        await self.ufc_stats.close()
+        await self.ufc_official.close()
+        await self.espn_mma.close()
+        self.http_cache.close()
+    
     async def scrape_events(self, 
                           mode: str = "full",
                           since: Optional[str] = None,
@@ -74,18 +87,23 @@ class UFCScraper:
             # Discover events from multiple sources
             discovered_events = await self._discover_events(mode, since)
             
-            # Scrape each event
-            for event_info in discovered_events:
-                try:
-                    event = await self._scrape_event_details(event_info)
-                    if event:
-                        events.append(event)
-                except Exception as e:
-                    logger.error(f"Failed to scrape event {event_info}: {e}")
-                    continue
+            # Scrape events concurrently, keeping discovery order
+            results = await asyncio.gather(
+                *(self._guarded_scrape_event_details(event_info) for event_info in discovered_events)
+            )
+            events.extend(event for event in results if event)
         
         return events
     
+    async def _guarded_scrape_event_details(self, event_info: Dict) -> Optional[UFCEvent]:
+        """Scrape event details under the concurrency limit, logging failures"""
+        async with self._event_sem:
+            try:
+                return await self._scrape_event_details(event_info)
+            except Exception as e:
+                logger.error(f"Failed to scrape event {event_info}: {e}")
+                return None
+    
     async def _discover_events(self, mode: str, since: Optional[str]) -> List[Dict]:
         """Discover events from multiple sources"""
         discovered = []
@@ -94,17 +112,20 @@ class UFCScraper:
         wikipedia_events = await self.wikipedia.discover_events(mode, since)
         discovered.extend(wikipedia_events)
         
-        # Only use other sources as fallback if Wikipedia found no events
+        # Only use other sources as fallback if Wikipedia found no events; they run
+        # together, so a fallback costs the slowest source rather than the sum of them
         if not wikipedia_events:
             logger.info("Wikipedia found no events, trying fallback sources...")
             
-            # Get events from UFCStats (backup)
-            ufc_stats_events = await self.ufc_stats.discover_events(mode, since)
-            discovered.extend(ufc_stats_events)
-            
-            # Get events from UFC.com (backup)
-            ufc_official_events = await self.ufc_official.discover_events(mode, since)
-            discovered.extend(ufc_official_events)
+            fallbacks = (
+                self.ufc_stats.discover_events(mode, since),  # backup
+                self.ufc_official.discover_events(mode, since),  # backup
+            )
+            for result in await asyncio.gather(*fallbacks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error(f"Fallback event discovery failed: {result}")
+                else:
+                    discovered.extend(result)
         
         # Deduplicate events
         unique_events = self._deduplicate_events(discovered)
@@ -118,8 +139,11 @@ class UFCScraper:
         seen = set()
         
         for event in events:
-            # Create a key for deduplication
-            key = (event.get('date'), event.get('name', '').lower().strip())
+            # Accepts both discovery and saved-event field names
+            key = event_dedup_key(
+                event.get('date') or event.get('event_date') or '',
+                event.get('name') or event.get('event_name') or ''
+            )
             if key not in seen:
                 seen.add(key)
                 unique.append(event)
@@ -154,23 +178,61 @@ class UFCScraper:
         
         return None
     
-    def save_events(self, events: List[UFCEvent]):
+    async def save_events(self, events: List[UFCEvent]):
         """Save events to JSON files and optionally database"""
-        for event in events:
-            # Save to JSON
-            filename = f"{event.event_id}.json"
-            filepath = self.output_dir / filename
+        loop = asyncio.get_running_loop()
+        
+        async def save_json(event: UFCEvent):
+            filepath = self.output_dir / f"{event.event_id}.json"
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                # Use model_dump with mode='json' to handle datetime serialization
-                event_dict = event.model_dump(mode='json')
-                json.dump(event_dict, f, indent=2, ensure_ascii=False)
+            # Use model_dump with mode='json' to handle datetime serialization
+            payload = event.model_dump(mode='json')
+            await loop.run_in_executor(None, dump_json, payload, filepath)
             
             logger.info(f"Saved event data to {filepath}")
-            
-            # Save to database if enabled
-            if self.db_manager:
-                self.db_manager.save_event(event)
+        
+        # Overlap the file writes in the default thread pool
+        await asyncio.gather(*(save_json(event) for event in events))
+        
+        # Save to database if enabled (the sqlite connection belongs to this thread)
+        if self.db_manager and events:
+            self.db_manager.save_events(events)
+
+
+async def run(event_id: Optional[str] = None,
+              rate_limit: float = 2.0,
+              mode: str = "full",
+              since: Optional[str] = None,
+              db: bool = False,
+              output_dir: str = "data",
+              scraper: Optional[UFCScraper] = None) -> List[UFCEvent]:
+    """
+    Scrape and save events in-process
+    
+    Args:
+        event_id: Specific event ID to scrape
+        rate_limit: Rate limit (requests per second) for a new scraper
+        mode: 'full', 'future', 'historical'
+        since: ISO date string for filtering
+        db: Enable database storage for a new scraper
+        output_dir: Output directory for JSON files for a new scraper
+        scraper: Existing scraper to reuse across calls (shares its rate limiter and sessions)
+    """
+    owns_scraper = scraper is None
+    if owns_scraper:
+        scraper = UFCScraper(rate_limit=rate_limit, output_dir=output_dir)
+        
+        if db:
+            scraper.enable_database()
+    
+    try:
+        events = await scraper.scrape_events(mode=mode, since=since, event_id=event_id)
+        await scraper.save_events(events)
+    finally:
+        if owns_scraper:
+            await scraper.close()
+    
+    return events
 
 
 @click.command()
@@ -188,14 +250,9 @@ def cli(mode: str, since: Optional[str], event_id: Optional[str],
     """UFC Event and Fight Data Scraper"""
     
     async def run_scraper():
-        scraper = UFCScraper(rate_limit=rate_limit, output_dir=output_dir)
-        
-        if db:
-            scraper.enable_database()
-        
         try:
-            events = await scraper.scrape_events(mode=mode, since=since, event_id=event_id)
-            scraper.save_events(events)
+            events = await run(event_id=event_id, rate_limit=rate_limit, mode=mode,
+                               since=since, db=db, output_dir=output_dir)
             
             click.echo(f"Successfully scraped {len(events)} events")
             
@@ -203,7 +260,20 @@ def cli(mode: str, since: Optional[str], event_id: Optional[str],
             logger.error(f"Scraping failed: {e}")
             click.echo(f"Error: {e}", err=True)
     
-    asyncio.run(run_scraper())
+    # uvloop is optional (POSIX only); fall back to the default loop without it
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(run_scraper())
+        return
+    
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(run_scraper())
+    else:
+        # Event loop policies are deprecated from 3.12 on, but are the way in before 3.11
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(run_scraper())
 
 
 if __name__ == '__main__':
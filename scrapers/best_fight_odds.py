@@ -7,38 +7,83 @@ import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from urllib.parse import urljoin, quote
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from models.ufc_models import FightOdds
 from utils.rate_limiter import RateLimiter
+from utils.http_cache import HttpCache, cache_key, event_ttl
+from config import USER_AGENT, BEST_FIGHT_ODDS_BASE_URL, HTTP_CACHE_TTL_FUTURE
 
 logger = logging.getLogger(__name__)
 
+_UFC_NUM_RE = re.compile(r'^ufc\s*\d+:?\s*')
+_NON_WORD_RE = re.compile(r'[^\w\s-]')
+_WS_RE = re.compile(r'\s+')
+_EVENT_HREF_RE = re.compile(r'/events/')
+_ODDS_CLEAN_RE = re.compile(r'[^\d+\-.]')
+
+EVENT_MATCH_THRESHOLD = 80  # % similarity for fuzzy event-name matches
+
 
 class BestFightOddsScraper:
     """Scraper for BestFightOdds.com"""
     
-    BASE_URL = "https://www.bestfightodds.com"
+    BASE_URL = BEST_FIGHT_ODDS_BASE_URL
+    
+    HEADERS = {
+        'User-Agent': USER_AGENT
+    }
     
-    def __init__(self, rate_limiter: RateLimiter):
+    def __init__(self, rate_limiter: RateLimiter, http_cache: Optional[HttpCache] = None):
         self.rate_limiter = rate_limiter
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.http_cache = http_cache
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Events index, fetched once per scraper: slug -> URL and link text -> URL
+        self._event_slugs: Optional[Dict[str, str]] = None
+        self._event_names: Optional[Dict[str, str]] = None
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, ttl_dns_cache=300),
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def _fetch_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse a web page with retry logic"""
+    async def _fetch_page(self, url: str, ttl: float = HTTP_CACHE_TTL_FUTURE) -> BeautifulSoup:
+        """Fetch and parse a web page with retry logic, served from the HTTP cache when fresh"""
+        key = cache_key(url)
+        cached = self.http_cache.get(key) if self.http_cache else None
+        if cached and cached.is_fresh(ttl):
+            return BeautifulSoup(cached.body, 'lxml')
+        
         await self.rate_limiter.wait()
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            headers = cached.conditional_headers() if cached else None
+            async with self._ensure_session().get(url, headers=headers) as response:
+                if cached and response.status == 304:
+                    self.http_cache.touch(key)
+                    return BeautifulSoup(cached.body, 'lxml')
+                response.raise_for_status()
+                content = await response.read()
+                if self.http_cache:
+                    self.http_cache.put(key, content, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+                return BeautifulSoup(content, 'lxml')
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise
@@ -64,7 +109,7 @@ class BestFightOddsScraper:
                 return odds_data
             
             # Scrape odds from event page
-            soup = await self._fetch_page(event_url)
+            soup = await self._fetch_page(event_url, ttl=event_ttl(event_date))
             odds_data = await self._parse_event_odds(soup)
             
         except Exception as e:
@@ -72,31 +117,37 @@ class BestFightOddsScraper:
         
         return odds_data
     
+    async def _load_events_index(self):
+        """Fetch the events index once and map its links by slug and by name"""
+        if self._event_slugs is None:
+            soup = await self._fetch_page(f"{self.BASE_URL}/events")
+            
+            slugs = {}
+            names = {}
+            for link in soup.find_all('a', href=_EVENT_HREF_RE):
+                url = urljoin(self.BASE_URL, link.get('href'))
+                slugs.setdefault(url.rstrip('/').rsplit('/', 1)[-1], url)
+                names.setdefault(link.text.strip().lower(), url)
+            
+            self._event_slugs, self._event_names = slugs, names
+        
+        return self._event_slugs, self._event_names
+    
     async def _find_event_url(self, event_name: str, event_date: str) -> Optional[str]:
         """Find the URL for a specific event"""
         try:
-            # Try to construct URL from event name
+            event_slugs, event_names = await self._load_events_index()
+            
+            # Try the slug built from the event name
             # BestFightOdds uses format like /events/ufc-305-du-plessis-vs-adesanya
             clean_name = self._clean_event_name(event_name)
-            potential_url = f"{self.BASE_URL}/events/{clean_name}"
+            if clean_name in event_slugs:
+                return event_slugs[clean_name]
             
-            # Test if URL exists
-            await self.rate_limiter.wait()
-            response = self.session.head(potential_url, timeout=10)
-            if response.status_code == 200:
-                return potential_url
-            
-            # If direct URL doesn't work, try searching the events page
-            events_url = f"{self.BASE_URL}/events"
-            soup = await self._fetch_page(events_url)
-            
-            # Look for event links
-            event_links = soup.find_all('a', href=re.compile(r'/events/'))
-            
-            for link in event_links:
-                link_text = link.text.strip().lower()
-                if self._is_event_match(link_text, event_name, event_date):
-                    return urljoin(self.BASE_URL, link.get('href'))
+            # Otherwise fuzzy match against the event link texts
+            name = self._match_event_name(list(event_names), event_name)
+            if name is not None:
+                return event_names[name]
             
         except Exception as e:
             logger.error(f"Error finding event URL: {e}")
@@ -107,16 +158,20 @@ class BestFightOddsScraper:
         """Clean event name for URL construction"""
         # Remove "UFC" prefix and convert to URL-friendly format
         name = event_name.lower()
-        name = re.sub(r'^ufc\s*\d+:?\s*', '', name)  # Remove UFC number
-        name = re.sub(r'[^\w\s-]', '', name)  # Remove special chars
-        name = re.sub(r'\s+', '-', name.strip())  # Replace spaces with hyphens
+        name = _UFC_NUM_RE.sub('', name)  # Remove UFC number
+        name = _NON_WORD_RE.sub('', name)  # Remove special chars
+        name = _WS_RE.sub('-', name.strip())  # Replace spaces with hyphens
         return name
     
-    def _is_event_match(self, link_text: str, event_name: str, event_date: str) -> bool:
-        """Check if a link matches the target event"""
-        # Use fuzzy matching to compare event names
-        similarity = fuzz.partial_ratio(link_text, event_name.lower())
-        return similarity > 80  # 80% similarity threshold
+    def _match_event_name(self, choices: List[str], event_name: str) -> Optional[str]:
+        """Return the link text that best matches the target event, if any"""
+        # Score every link in one C-level pass rather than one call per link
+        match = process.extractOne(event_name.lower(), choices, scorer=fuzz.partial_ratio,
+                                   score_cutoff=EVENT_MATCH_THRESHOLD)
+        # Keep the strict "more than 80% similar" rule
+        if match and match[1] > EVENT_MATCH_THRESHOLD:
+            return match[0]
+        return None
     
     async def _parse_event_odds(self, soup: BeautifulSoup) -> Dict[str, FightOdds]:
         """Parse odds from an event page"""
@@ -194,7 +249,7 @@ class BestFightOddsScraper:
             return None
         
         # Remove any non-numeric characters except +, -, and .
-        clean_odds = re.sub(r'[^\d+\-.]', '', odds_text)
+        clean_odds = _ODDS_CLEAN_RE.sub('', odds_text)
         
         try:
             return float(clean_odds)
@@ -209,13 +264,14 @@ class BestFightOddsScraper:
             params = {'q': fighter_name}
             
             await self.rate_limiter.wait()
-            response = self.session.get(search_url, params=params, timeout=30)
-            response.raise_for_status()
+            async with self._ensure_session().get(search_url, params=params) as response:
+                response.raise_for_status()
+                content = await response.read()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(content, 'lxml')
             
             # Parse search results
-            fight_links = soup.find_all('a', href=re.compile(r'/events/'))
+            fight_links = soup.find_all('a', href=_EVENT_HREF_RE)
             
             odds_history = []
             for link in fight_links:
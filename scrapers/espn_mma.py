@@ -2,47 +2,101 @@
 ESPN MMA API scraper
 """
 
-import json
 import logging
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-import requests
+from datetime import date, datetime
+from typing import List, Optional, Dict, Any, Tuple
+import aiohttp
+import orjson
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from models.ufc_models import UFCEvent, Fight, Fighter, EventStatus, TitleFightType
 from utils.rate_limiter import RateLimiter
+from utils.http_cache import HttpCache, cache_key, event_ttl
+from config import USER_AGENT, ESPN_MMA_BASE_URL, ESPN_MMA_EVENTS_URL
 
 logger = logging.getLogger(__name__)
 
 
+def _venue_location(competitions: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+    """Venue name and "city, state, country" location from an ESPN competitions list"""
+    venue_data = competitions[0].get('venue') if competitions else None
+    if not venue_data:
+        return None, None
+    
+    address = venue_data.get('address')
+    location = None
+    if address:
+        location = ', '.join(filter(None, (address.get('city'), address.get('state'), address.get('country'))))
+    return venue_data.get('fullName'), location
+
+
 class ESPNMMAScraper:
     """Scraper for ESPN MMA API"""
     
-    BASE_URL = "https://site.web.api.espn.com/apis/v2/sports/mma/ufc"
-    EVENTS_URL = f"{BASE_URL}/events"
+    BASE_URL = ESPN_MMA_BASE_URL
+    EVENTS_URL = ESPN_MMA_EVENTS_URL
     
-    def __init__(self, rate_limiter: RateLimiter):
+    HEADERS = {
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json',
+        'Accept-Language': 'en-US,en;q=0.9'
+    }
+    
+    def __init__(self, rate_limiter: RateLimiter, http_cache: Optional[HttpCache] = None):
         self.rate_limiter = rate_limiter
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9'
-        })
+        self.http_cache = http_cache
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=10, ttl_dns_cache=300),
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
     
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Fetch JSON data with retry logic"""
+        """Fetch JSON data with retry logic, served from the HTTP cache when fresh"""
+        key = cache_key(url, params)
+        cached = self.http_cache.get(key) if self.http_cache else None
+        if cached:
+            cached_data = orjson.loads(cached.body)
+            if cached.is_fresh(self._cache_ttl(cached_data)):
+                return cached_data
+        
         await self.rate_limiter.wait()
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
+            headers = cached.conditional_headers() if cached else None
+            async with self._ensure_session().get(url, params=params, headers=headers) as response:
+                if cached and response.status == 304:
+                    self.http_cache.touch(key)
+                    return cached_data
+                response.raise_for_status()
+                body = await response.read()
+                data = orjson.loads(body)
+                if self.http_cache:
+                    self.http_cache.put(key, body, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+                return data
         except Exception as e:
             logger.error(f"Failed to fetch JSON from {url}: {e}")
             raise
     
+    def _cache_ttl(self, data: Dict) -> float:
+        """Cache lifetime for a payload: long for finished events, short otherwise"""
+        date_str = data.get('event', {}).get('date')
+        return event_ttl(date_str[:10] if date_str else None)
+    
     async def discover_events(self, mode: str = "full", since: Optional[str] = None) -> List[Dict]:
         """Discover UFC events from ESPN MMA API"""
         events = []
@@ -52,25 +106,29 @@ class ESPNMMAScraper:
             params = {'limit': 100}
             data = await self._fetch_json(self.EVENTS_URL, params)
             
+            now = datetime.now()
+            since_date = datetime.strptime(since, '%Y-%m-%d') if since else None
+            
             for event_data in data.get('events', []):
-                event_info = self._parse_api_event(event_data)
+                # Filter on the date alone before building the rest of the event
+                event_date = self._parse_espn_date(event_data.get('date'))
+                if event_date is None:
+                    logger.warning(f"Skipping ESPN event {event_data.get('id')} with invalid date {event_data.get('date')!r}")
+                    continue
+                event_datetime = datetime.strptime(event_date, '%Y-%m-%d')
+                
+                # Filter by date if specified
+                if since_date and event_datetime < since_date:
+                    continue
+                
+                # Filter by mode
+                if mode == "future" and event_datetime <= now:
+                    continue
+                elif mode == "historical" and event_datetime > now:
+                    continue
+                
+                event_info = self._parse_api_event(event_data, event_date)
                 if event_info:
-                    # Filter by date if specified
-                    if since:
-                        event_date = datetime.strptime(event_info['date'], '%Y-%m-%d')
-                        since_date = datetime.strptime(since, '%Y-%m-%d')
-                        if event_date < since_date:
-                            continue
-                    
-                    # Filter by mode
-                    event_datetime = datetime.strptime(event_info['date'], '%Y-%m-%d')
-                    now = datetime.now()
-                    
-                    if mode == "future" and event_datetime <= now:
-                        continue
-                    elif mode == "historical" and event_datetime > now:
-                        continue
-                    
                     events.append(event_info)
             
         except Exception as e:
@@ -79,7 +137,21 @@ class ESPNMMAScraper:
         logger.info(f"Discovered {len(events)} events from ESPN MMA")
         return events
     
-    def _parse_api_event(self, event_data: Dict) -> Optional[Dict]:
+    def _parse_espn_date(self, date_str: Optional[str]) -> Optional[str]:
+        """Convert an ESPN ISO timestamp to YYYY-MM-DD (today if missing, None if invalid)"""
+        if not date_str:
+            return datetime.now().strftime('%Y-%m-%d')
+        try:
+            # ESPN dates look like 2024-08-17T22:00Z; the date is the first 10 chars
+            return date.fromisoformat(date_str[:10]).isoformat()
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+        except ValueError:
+            return None
+    
+    def _parse_api_event(self, event_data: Dict, event_date: Optional[str] = None) -> Optional[Dict]:
         """Parse event data from ESPN API response"""
         try:
             event_id = event_data.get('id')
@@ -89,31 +161,13 @@ class ESPNMMAScraper:
             name = event_data.get('name', '')
             
             # Parse date
-            date_str = event_data.get('date')
-            if date_str:
-                try:
-                    event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                except ValueError:
-                    event_date = datetime.now().strftime('%Y-%m-%d')
-            else:
-                event_date = datetime.now().strftime('%Y-%m-%d')
+            if event_date is None:
+                event_date = self._parse_espn_date(event_data.get('date'))
+                if event_date is None:
+                    return None
             
             # Extract location
-            location = None
-            venue = None
-            
-            competitions = event_data.get('competitions', [])
-            if competitions:
-                venue_data = competitions[0].get('venue', {})
-                if venue_data:
-                    venue = venue_data.get('fullName')
-                    address = venue_data.get('address', {})
-                    if address:
-                        city = address.get('city')
-                        state = address.get('state')
-                        country = address.get('country')
-                        location_parts = [city, state, country]
-                        location = ', '.join(filter(None, location_parts))
+            venue, location = _venue_location(event_data.get('competitions', []))
             
             return {
                 'id': str(event_id),
@@ -149,31 +203,14 @@ class ESPNMMAScraper:
             event_name = event_data.get('name', 'Unknown Event')
             
             # Parse date
-            date_str = event_data.get('date')
-            if date_str:
-                try:
-                    event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                except ValueError:
-                    event_date = datetime.now().strftime('%Y-%m-%d')
-            else:
-                event_date = datetime.now().strftime('%Y-%m-%d')
+            event_date = self._parse_espn_date(event_data.get('date'))
+            if event_date is None:
+                logger.warning(f"ESPN event {event_id} has an invalid date {event_data.get('date')!r}")
+                return None
             
             # Extract venue and location
-            venue = None
-            location = None
-            
             competitions = event_data.get('competitions', [])
-            if competitions:
-                venue_data = competitions[0].get('venue', {})
-                if venue_data:
-                    venue = venue_data.get('fullName')
-                    address = venue_data.get('address', {})
-                    if address:
-                        city = address.get('city')
-                        state = address.get('state')
-                        country = address.get('country')
-                        location_parts = [city, state, country]
-                        location = ', '.join(filter(None, location_parts))
+            venue, location = _venue_location(competitions)
             
             # Determine status
             status = EventStatus.SCHEDULED
@@ -182,7 +219,7 @@ class ESPNMMAScraper:
                 status = EventStatus.COMPLETED
             
             # Extract fights
-            fights = await self._extract_fights(competitions)
+            fights = self._extract_fights(competitions)
             
             event = UFCEvent(
                 event_id=event_id,
@@ -201,7 +238,7 @@ class ESPNMMAScraper:
             logger.error(f"Error parsing ESPN event details: {e}")
             return None
     
-    async def _extract_fights(self, competitions: List[Dict]) -> List[Fight]:
+    def _extract_fights(self, competitions: List[Dict]) -> List[Fight]:
         """Extract fight information from competitions"""
         fights = []
         
@@ -269,7 +306,7 @@ class ESPNMMAScraper:
         
         # Reverse order so main event is first
         fights.reverse()
-        for i, fight in enumerate(fights):
-            fight.bout_order = i + 1
+        for bout_order, fight in enumerate(fights, 1):
+            fight.bout_order = bout_order
         
         return fights
\ No newline at end of file
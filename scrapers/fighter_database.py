@@ -3,11 +3,14 @@ UFC Fighter Database Scraper - Scrapes comprehensive fighter list from Wikipedia
 """
 
 import re
+import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+import aiohttp
+import orjson
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 import sys
@@ -16,31 +19,129 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.ufc_models import Fighter, FighterRecord
 from utils.rate_limiter import RateLimiter
+from config import dump_json, FIGHTERS_CACHE_FILENAME
 
 logger = logging.getLogger(__name__)
 
+# Only the section headings and the tables under them are read from the page
+PAGE_STRAINER = SoupStrainer(['h2', 'h3', 'h4', 'table'])
+
+# (weight class, heading text pattern, heading id pattern)
+_WEIGHT_CLASS_PATTERNS = [
+    (name, re.compile(name, re.IGNORECASE), re.compile(name.replace(' ', '_'), re.IGNORECASE))
+    for name in (
+        'Heavyweight', 'Light Heavyweight', 'Middleweight', 'Welterweight',
+        'Lightweight', 'Featherweight', 'Bantamweight', 'Flyweight',
+        "Women's Featherweight", "Women's Bantamweight", "Women's Flyweight",
+        "Women's Strawweight"
+    )
+]
+
+# W-L[-D] [(N NC)] with regular hyphens or en-dashes
+_RECORD_RE = re.compile(r'(\d+)[-–](\d+)(?:[-–](\d+))?(?:\s*\((\d+)\s*NC\))?', re.IGNORECASE)
+
+# Column -> header keywords; a column is the first header containing any keyword
+_COLUMN_KEYWORDS = {
+    'name': ('name', 'fighter'),
+    'record': ('mma record',),  # Only MMA record
+    'country': ('iso', 'country'),
+    'age': ('age',),
+    'height': ('ht.', 'height'),
+    'nickname': ('nickname',),
+}
+
+# Exact header text -> column, for the usual Wikipedia headers
+_HEADER_COLUMNS = {
+    keyword: column for column, keywords in _COLUMN_KEYWORDS.items() for keyword in keywords
+}
+
+
+def _cell_text(cell) -> str:
+    """Stripped text of a cell, skipping the descendant walk when it holds a single string"""
+    text = cell.string
+    if type(text) is NavigableString:
+        return text.strip()
+    return cell.get_text(strip=True)
+
+
+def _first_int(text: str) -> Optional[int]:
+    """First run of digits in text as an int (e.g. the age in '35 years'), or None"""
+    n = len(text)
+    i = 0
+    while i < n and not text[i].isdecimal():
+        i += 1
+    j = i
+    while j < n and text[j].isdecimal():
+        j += 1
+    return int(text[i:j]) if j > i else None
+
 
 class UFCFighterDatabaseScraper:
     """Scraper for Wikipedia's List of current UFC fighters page"""
     
     FIGHTERS_LIST_URL = "https://en.wikipedia.org/wiki/List_of_current_UFC_fighters"
     
-    def __init__(self, rate_limiter: RateLimiter):
+    # aiohttp negotiates gzip/deflate itself, and br when Brotli is installed
+    HEADERS = {
+        'User-Agent': 'UFC-Scraper/1.0 (Educational/Research Purpose)',
+        'Accept': 'text/html'
+    }
+    
+    def __init__(self, rate_limiter: RateLimiter, cache_file: Optional[str] = None):
         self.rate_limiter = rate_limiter
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'UFC-Scraper/1.0 (Educational/Research Purpose)'
-        })
+        # Parsed fighters plus the page's ETag/Last-Modified, reused while the page is unchanged
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.session: Optional[aiohttp.ClientSession] = None
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _fetch_page(self, url: str) -> BeautifulSoup:
         """Fetch and parse a web page with retry logic"""
+        soup, _ = await self._fetch_page_if_modified(url)
+        return soup
+    
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _fetch_page_if_modified(self, url: str, validators: Optional[Dict] = None
+                                      ) -> Tuple[Optional[BeautifulSoup], Dict]:
+        """
+        Fetch and parse a web page unless it still matches the given validators
+        
+        Returns:
+            (soup, validators) for a fresh page, or (None, validators) if not modified
+        """
         await self.rate_limiter.wait()
         
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            async with self._ensure_session().get(url, headers=headers) as response:
+                if headers and response.status == 304:
+                    return None, validators
+                response.raise_for_status()
+                content = await response.read()
+                new_validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+            return BeautifulSoup(content, 'lxml', parse_only=PAGE_STRAINER), new_validators
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise
@@ -49,7 +150,15 @@ class UFCFighterDatabaseScraper:
         """Scrape all fighters from the UFC fighters list page"""
         try:
             logger.info("Fetching UFC fighters database...")
-            soup = await self._fetch_page(self.FIGHTERS_LIST_URL)
+            cache = self._load_cache()
+            soup, validators = await self._fetch_page_if_modified(
+                self.FIGHTERS_LIST_URL, cache['validators'] if cache else None
+            )
+            
+            if soup is None:
+                fighters_dict = {name: Fighter(**data) for name, data in cache['fighters'].items()}
+                logger.info(f"Fighters page unchanged, reusing {len(fighters_dict)} cached fighters")
+                return fighters_dict
             
             fighters_dict = {}
             
@@ -70,37 +179,69 @@ class UFCFighterDatabaseScraper:
                     fighters_dict[key] = fighter
             
             logger.info(f"Successfully scraped {len(fighters_dict)} fighters")
+            self._save_cache(validators, fighters_dict)
             return fighters_dict
             
         except Exception as e:
             logger.error(f"Error scraping fighter database: {e}")
             return {}
     
+    def _load_cache(self) -> Optional[Dict]:
+        """Load the cached fighters and page validators, if present"""
+        if not self.cache_file or not self.cache_file.is_file():
+            return None
+        
+        try:
+            cache = orjson.loads(self.cache_file.read_bytes())
+            if cache.get('fighters') and cache.get('validators'):
+                return cache
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable fighters cache {self.cache_file}: {e}")
+        return None
+    
+    def _save_cache(self, validators: Dict, fighters_dict: Dict[str, Fighter]):
+        """Store the parsed fighters with the validators of the page they came from"""
+        if not self.cache_file or not fighters_dict or not any(validators.values()):
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            dump_json({
+                'validators': validators,
+                'fighters': {name: fighter.model_dump(mode='json') for name, fighter in fighters_dict.items()}
+            }, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to write fighters cache {self.cache_file}: {e}")
+    
     def _find_weight_class_sections(self, soup: BeautifulSoup) -> Dict[str, BeautifulSoup]:
         """Find all weight class sections and their tables"""
         weight_class_sections = {}
         
-        # Look for weight class headings
-        weight_class_patterns = [
-            r'Heavyweight', r'Light Heavyweight', r'Middleweight', r'Welterweight',
-            r'Lightweight', r'Featherweight', r'Bantamweight', r'Flyweight',
-            r"Women's Featherweight", r"Women's Bantamweight", r"Women's Flyweight", 
-            r"Women's Strawweight"
-        ]
-        
-        for pattern in weight_class_patterns:
-            # Find heading
-            heading = soup.find(['h2', 'h3', 'h4'], string=re.compile(pattern, re.IGNORECASE))
-            if not heading:
-                # Try finding by id or class
-                heading = soup.find(['h2', 'h3', 'h4'], id=re.compile(pattern.replace(' ', '_'), re.IGNORECASE))
+        # Classify every heading in one pass, keeping the first match per weight class
+        by_text = {}
+        by_id = {}
+        for heading in soup.find_all(['h2', 'h3', 'h4']):
+            text = heading.string
+            heading_id = heading.get('id')
+            for weight_class, text_pattern, id_pattern in _WEIGHT_CLASS_PATTERNS:
+                if text is not None and weight_class not in by_text and text_pattern.search(text):
+                    by_text[weight_class] = heading
+                if heading_id and weight_class not in by_id and id_pattern.search(heading_id):
+                    by_id[weight_class] = heading
+        
+        for weight_class, _, _ in _WEIGHT_CLASS_PATTERNS:
+            # Prefer a heading matched by text, then by id
+            heading = by_text.get(weight_class) or by_id.get(weight_class)
             
             if heading:
-                # Find the next table after this heading
-                table = heading.find_next('table', class_='wikitable')
+                # Find the next table after this heading: with the page strained to
+                # headings and tables it is normally a sibling, so try those first
+                table = heading.find_next_sibling('table', class_='wikitable')
+                if table is None:
+                    table = heading.find_next('table', class_='wikitable')
                 if table:
-                    weight_class_sections[pattern] = table
-                    logger.debug(f"Found table for {pattern}")
+                    weight_class_sections[weight_class] = table
+                    logger.debug(f"Found table for {weight_class}")
         
         return weight_class_sections
     
@@ -113,32 +254,44 @@ class UFCFighterDatabaseScraper:
         if not header_row:
             return fighters
         
-        headers = [th.get_text(strip=True).lower() for th in header_row.find_all(['th', 'td'])]
+        headers = [th.get_text(strip=True).lower() for th in header_row.find_all(['th', 'td'], recursive=False)]
         
-        # Map column names - focus on MMA record only
-        name_col = self._find_column_index(headers, ['name', 'fighter'])
-        record_col = self._find_column_index(headers, ['mma record'])  # Only MMA record
-        country_col = self._find_column_index(headers, ['iso', 'country'])
-        age_col = self._find_column_index(headers, ['age'])
-        height_col = self._find_column_index(headers, ['ht.', 'height'])
-        nickname_col = self._find_column_index(headers, ['nickname'])
+        # Map column names in one pass over the headers - focus on MMA record only.
+        # Exact header names are a dict lookup and win over substring matches
+        # (so 'nickname' is never taken for the name column)
+        exact = {}
+        partial = {}
+        for i, header in enumerate(headers):
+            column = _HEADER_COLUMNS.get(header)
+            if column is not None:
+                exact.setdefault(column, i)
+                continue
+            for column, keywords in _COLUMN_KEYWORDS.items():
+                if column not in partial and any(keyword in header for keyword in keywords):
+                    partial[column] = i
+        columns = {**partial, **exact}
+        
+        # Only the columns this table actually has
+        column_items = list(columns.items())
         
         logger.debug(f"Headers found: {headers}")
-        logger.debug(f"MMA record column: {record_col}")
+        logger.debug(f"MMA record column: {columns.get('record')}")
         
         # Process each fighter row
         rows = table.find_all('tr')[1:]  # Skip header row
         
         for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) < 2:  # Skip rows with too few columns
+            # Cells are direct children of the row; don't descend into their links and flags
+            cells = row.find_all(['td', 'th'], recursive=False)
+            num_cells = len(cells)
+            if num_cells < 2:  # Skip rows with too few columns
                 continue
             
+            # Short rows (e.g. under a rowspan) just lack their trailing columns
+            row_cells = {column: cells[i] for column, i in column_items if i < num_cells}
+            
             try:
-                fighter = self._parse_fighter_row(
-                    cells, name_col, record_col, country_col, 
-                    age_col, height_col, nickname_col, weight_class
-                )
+                fighter = self._parse_fighter_row(row_cells, weight_class)
                 if fighter:
                     fighters.append(fighter)
             except Exception as e:
@@ -147,30 +300,19 @@ class UFCFighterDatabaseScraper:
         
         return fighters
     
-    def _find_column_index(self, headers: List[str], possible_names: List[str]) -> Optional[int]:
-        """Find the index of a column by possible header names"""
-        for i, header in enumerate(headers):
-            for name in possible_names:
-                if name in header:
-                    return i
-        return None
-    
-    def _parse_fighter_row(self, cells, name_col: Optional[int], record_col: Optional[int], 
-                          country_col: Optional[int], age_col: Optional[int], 
-                          height_col: Optional[int], nickname_col: Optional[int], 
-                          weight_class: str) -> Optional[Fighter]:
-        """Parse a single fighter row"""
+    def _parse_fighter_row(self, row_cells: Dict, weight_class: str) -> Optional[Fighter]:
+        """Parse a single fighter row from its cells keyed by column"""
         
         # Extract name
         name = None
-        if name_col is not None and name_col < len(cells):
-            name_cell = cells[name_col]
+        name_cell = row_cells.get('name')
+        if name_cell is not None:
             # Look for links first (fighter names are usually linked)
             name_link = name_cell.find('a')
             if name_link:
-                name = name_link.get_text(strip=True)
+                name = _cell_text(name_link)
             else:
-                name = name_cell.get_text(strip=True)
+                name = _cell_text(name_cell)
         
         if not name:
             return None
@@ -178,40 +320,41 @@ class UFCFighterDatabaseScraper:
         # Extract record
         record_breakdown = None
         record_string = None
-        if record_col is not None and record_col < len(cells):
-            record_text = cells[record_col].get_text(strip=True)
+        record_cell = row_cells.get('record')
+        if record_cell is not None:
+            record_text = _cell_text(record_cell)
             record_breakdown = self._parse_record_string(record_text)
             if record_breakdown:
                 record_string = record_breakdown.to_record_string()
         
         # Extract country
         country = None
-        if country_col is not None and country_col < len(cells):
-            country_cell = cells[country_col]
+        country_cell = row_cells.get('country')
+        if country_cell is not None:
             # Look for country name in text or alt text of flag images
             img = country_cell.find('img')
             if img and img.get('alt'):
                 country = img.get('alt')
             else:
-                country = country_cell.get_text(strip=True)
+                country = _cell_text(country_cell)
         
         # Extract age
         age = None
-        if age_col is not None and age_col < len(cells):
-            age_text = cells[age_col].get_text(strip=True)
-            age_match = re.search(r'(\d+)', age_text)
-            if age_match:
-                age = int(age_match.group(1))
+        age_cell = row_cells.get('age')
+        if age_cell is not None:
+            age = _first_int(_cell_text(age_cell))
         
         # Extract height
         height = None
-        if height_col is not None and height_col < len(cells):
-            height = cells[height_col].get_text(strip=True)
+        height_cell = row_cells.get('height')
+        if height_cell is not None:
+            height = _cell_text(height_cell)
         
         # Extract nickname
         nickname = None
-        if nickname_col is not None and nickname_col < len(cells):
-            nickname = cells[nickname_col].get_text(strip=True)
+        nickname_cell = row_cells.get('nickname')
+        if nickname_cell is not None:
+            nickname = _cell_text(nickname_cell)
             if nickname and nickname.strip() in ['', '-', 'N/A']:
                 nickname = None
         
@@ -233,27 +376,16 @@ class UFCFighterDatabaseScraper:
         if not record_text:
             return None
         
-        # Look for W-L-D pattern (handles both regular hyphens and en-dashes)
-        record_match = re.search(r'(\d+)[-–](\d+)[-–](\d+)', record_text)
+        # One pass for wins, losses and the optional draws and no contests
+        record_match = _RECORD_RE.search(record_text)
         if not record_match:
-            # Try W-L pattern (no draws column)
-            record_match = re.search(r'(\d+)[-–](\d+)', record_text)
-            if record_match:
-                wins = int(record_match.group(1))
-                losses = int(record_match.group(2))
-                draws = 0  # Default to 0 draws
-            else:
-                return None
-        else:
-            wins = int(record_match.group(1))
-            losses = int(record_match.group(2))
-            draws = int(record_match.group(3))
-        
-        # Look for no contests
-        no_contests = None
-        nc_match = re.search(r'\((\d+)\s*NC\)', record_text, re.IGNORECASE)
-        if nc_match:
-            no_contests = int(nc_match.group(1))
+            return None
+        
+        wins, losses, draws, no_contests = record_match.groups()
+        wins = int(wins)
+        losses = int(losses)
+        draws = int(draws) if draws else 0
+        no_contests = int(no_contests) if no_contests else None
         
         return FighterRecord(
             wins=wins,
@@ -263,29 +395,26 @@ class UFCFighterDatabaseScraper:
         )
 
 
-async def build_fighter_database() -> Dict[str, Fighter]:
+async def build_fighter_database(cache_file: Optional[str] = None) -> Dict[str, Fighter]:
     """Build comprehensive fighter database from Wikipedia"""
     rate_limiter = RateLimiter(requests_per_second=1.0)
-    scraper = UFCFighterDatabaseScraper(rate_limiter)
-    return await scraper.scrape_fighter_database()
+    scraper = UFCFighterDatabaseScraper(rate_limiter, cache_file)
+    try:
+        return await scraper.scrape_fighter_database()
+    finally:
+        await scraper.close()
 
 
 if __name__ == "__main__":
-    import asyncio
-    import json
-    
     async def main():
-        fighters_db = await build_fighter_database()
+        fighters_db = await build_fighter_database(Path('data') / FIGHTERS_CACHE_FILENAME)
         
         print(f"Scraped {len(fighters_db)} fighters")
         
         # Save to file
-        fighters_dict = {}
-        for name, fighter in fighters_db.items():
-            fighters_dict[name] = fighter.model_dump()
+        fighters_dict = {name: fighter.model_dump(mode='json') for name, fighter in fighters_db.items()}
         
-        with open('data/fighter_database.json', 'w') as f:
-            json.dump(fighters_dict, f, indent=2, default=str)
+        dump_json(fighters_dict, 'data/fighter_database.json')
         
         print("Fighter database saved to data/fighter_database.json")
     
@@ -2,71 +2,252 @@
 UFC.com official website scraper
 """
 
+import re
+import sys
 import json
+import time
+import asyncio
 import logging
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import List, Optional, Dict, Any, Tuple
 from urllib.parse import urljoin
-import requests
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
+import aiohttp
+import orjson
+import soupsieve as sv
+from bs4 import BeautifulSoup, FeatureNotFound
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 from models.ufc_models import UFCEvent, Fight, Fighter, EventStatus, TitleFightType
 from utils.rate_limiter import RateLimiter
+from utils.http_cache import HttpCache, cache_key
+from config import USER_AGENT, UFC_OFFICIAL_BASE_URL, UFC_OFFICIAL_API_URL, HTTP_CACHE_TTL_FUTURE
 
 logger = logging.getLogger(__name__)
 
+# Text searches, matched by BeautifulSoup against each string in the tree
+_MONTH_RE = re.compile(r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec')
+_UPCOMING_RE = re.compile(r'upcoming', re.IGNORECASE)
+_RESULTS_RE = re.compile(r'results', re.IGNORECASE)
+
+# Dates on event pages: ISO dates take a fast path, anything else is tried against these formats
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_FULL_MONTHS = frozenset(('january', 'february', 'march', 'april', 'may', 'june', 'july',
+                          'august', 'september', 'october', 'november', 'december'))
+
+# Event card selectors for the events listing page, compiled once
+_EVENT_CARD_SELECTORS = [sv.compile(selector) for selector in (
+    '.c-card-event',
+    '.event-card',
+    '.c-listing-fight',
+    'article.c-card',
+    '.view-events .views-row'
+)]
+
+# Fight card segments, keyed by the id/class UFC.com gives each section
+FIGHT_SEGMENTS = ('main-card', 'prelims', 'early-prelims')
+_HEADER_TAGS = ('h2', 'h3', 'h4')
+
+# Hero header blocks holding the event date, venue and location, most specific first
+_HERO_INFO_CLASSES = ('hero-profile__info', 'c-hero__info')
+
+# Class lookups for fight listings, tried in order
+_FIGHT_CLASSES = ('l-listing__item', 'c-listing-fight', 'fight-card__fight')
+_FIGHTER_NAME_CLASSES = ('c-listing-fight__corner-name', 'c-listing-fight__fighter-name', 'fight-card__fighter-name')
+_WEIGHT_CLASS_CLASSES = ('c-listing-fight__class-text', 'fight-card__weight-class')
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a failed request is worth retrying (network trouble, throttling or a server error)"""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def _is_segment_section(tag) -> bool:
+    """Match a fight card section by its id or class"""
+    return tag.get('id') in FIGHT_SEGMENTS or any(class_name in FIGHT_SEGMENTS for class_name in tag.get('class', ()))
+
+
+def _is_header_or_fight(tag) -> bool:
+    """Match section headers and fight listings for the header-based segment fallback"""
+    return tag.name in _HEADER_TAGS or 'c-listing-fight' in tag.get('class', ())
+
+
+def _header_segment(header) -> Optional[str]:
+    """Segment key for a "Main Card" / "Prelims" / "Early Prelims" header, if it is one"""
+    section_name = (header.string or '').lower()
+    if 'main card' in section_name:
+        return 'main-card'
+    elif 'early prelim' in section_name:
+        return 'early-prelims'
+    elif 'prelim' in section_name:
+        return 'prelims'
+    return None
+
+
+def _parse_html(content: bytes) -> BeautifulSoup:
+    """Parse a page with lxml, falling back to html.parser when lxml is unavailable"""
+    try:
+        return BeautifulSoup(content, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(content, 'html.parser')
+
+
+def _normalise_since(since: Optional[str]) -> Optional[str]:
+    """Validate a YYYY-MM-DD cutoff and zero-pad it for string comparison"""
+    return datetime.strptime(since, '%Y-%m-%d').strftime('%Y-%m-%d') if since else None
+
+
+def _parse_date_text(date_text: str) -> Optional[str]:
+    """Normalise a date string to YYYY-MM-DD, or None if it matches no known format"""
+    if _ISO_DATE_RE.fullmatch(date_text):
+        try:
+            return date.fromisoformat(date_text).isoformat()
+        except ValueError:
+            return None
+    
+    # Pick the one format the month token can match instead of trying each in turn
+    if '-' in date_text:
+        fmt = '%Y-%m-%d'
+    elif date_text.split(' ', 1)[0].lower() in _FULL_MONTHS:
+        fmt = '%B %d, %Y'
+    else:
+        fmt = '%b %d, %Y'
+    try:
+        return datetime.strptime(date_text, fmt).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
 
 class UFCOfficialScraper:
     """Scraper for UFC.com official website"""
     
-    BASE_URL = "https://www.ufc.com"
+    BASE_URL = UFC_OFFICIAL_BASE_URL
     EVENTS_URL = f"{BASE_URL}/events"
+    EVENTS_API = UFC_OFFICIAL_API_URL
+    
+    # No Accept-Encoding here: aiohttp negotiates gzip/deflate itself, and br when Brotli is installed
+    HEADERS = {
+        'User-Agent': USER_AGENT,
+        'Accept': 'application/json, text/plain, */*',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Referer': 'https://www.ufc.com/events'
+    }
+    
+    # Pages fetched at once by scrape_events_bulk, and the per-host connection pool size
+    MAX_CONCURRENT_FETCHES = 10
+    
+    EVENT_CACHE_TTL = 300  # seconds a scraped event is reused within a run
+    EVENT_CACHE_SIZE = 64  # most recently used events kept
     
-    def __init__(self, rate_limiter: RateLimiter):
+    MAX_API_PAGES = 5  # past-event pages read from the events API fallback
+    
+    def __init__(self, rate_limiter: RateLimiter, http_cache: Optional[HttpCache] = None):
         self.rate_limiter = rate_limiter
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.ufc.com/events'
-        })
+        self.http_cache = http_cache
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Recently scraped events, least recently used first: event_id -> (monotonic time scraped, event)
+        self._event_cache: 'OrderedDict[str, Tuple[float, UFCEvent]]' = OrderedDict()
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            # Keep-alive connections sized to scrape_events_bulk, kept open across
+            # rate-limiter gaps so bulk scrapes reuse their TLS sessions
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.MAX_CONCURRENT_FETCHES,
+                                               ttl_dns_cache=300, keepalive_timeout=30),
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
-        """Fetch JSON data with retry logic"""
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           retry=retry_if_exception(_is_transient), reraise=True)
+    async def _fetch_json(self, url: str, params: Optional[Dict] = None,
+                          ttl: float = HTTP_CACHE_TTL_FUTURE) -> Dict:
+        """Fetch JSON data with retry logic, served from the HTTP cache when fresh"""
+        key = cache_key(url, params)
+        cached = self.http_cache.get(key) if self.http_cache else None
+        if cached and cached.is_fresh(ttl):
+            return orjson.loads(cached.body)
+        
         await self.rate_limiter.wait()
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
+            headers = {'Accept': 'application/json'}
+            if cached:
+                headers.update(cached.conditional_headers())
+            async with self._ensure_session().get(url, params=params, headers=headers) as response:
+                if cached and response.status == 304:
+                    # Unchanged since the last fetch
+                    self.http_cache.touch(key)
+                    return orjson.loads(cached.body)
+                response.raise_for_status()
+                body = await response.read()
+                data = orjson.loads(body)
+                if self.http_cache:
+                    self.http_cache.put(key, body, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+                return data
         except Exception as e:
             logger.error(f"Failed to fetch JSON from {url}: {e}")
             raise
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def _fetch_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse a web page with retry logic"""
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           retry=retry_if_exception(_is_transient), reraise=True)
+    async def _fetch_page(self, url: str, ttl: float = HTTP_CACHE_TTL_FUTURE) -> BeautifulSoup:
+        """Fetch and parse a web page with retry logic, served from the HTTP cache when fresh"""
+        key = cache_key(url)
+        cached = self.http_cache.get(key) if self.http_cache else None
+        if cached and cached.is_fresh(ttl):
+            return await self._parse_page(cached.body)
+        
         await self.rate_limiter.wait()
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            headers = cached.conditional_headers() if cached else None
+            async with self._ensure_session().get(url, headers=headers) as response:
+                if cached and response.status == 304:
+                    self.http_cache.touch(key)
+                    return await self._parse_page(cached.body)
+                response.raise_for_status()
+                content = await response.read()
+                if self.http_cache:
+                    self.http_cache.put(key, content, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+            return await self._parse_page(content)
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise
     
+    async def _parse_page(self, content: bytes) -> BeautifulSoup:
+        """Parse a page in the default thread pool so other scrapes keep running meanwhile"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _parse_html, content)
+    
     async def discover_events(self, mode: str = "full", since: Optional[str] = None) -> List[Dict]:
         """Discover UFC events from UFC.com"""
         events = []
         
         try:
-            # Since the API endpoint is not working, let's scrape the events page directly
             soup = await self._fetch_page(self.EVENTS_URL)
             events = await self._parse_events_page(soup, mode, since)
+            
+            # Fall back to the events API when the page gives nothing (e.g. after a redesign)
+            if not events:
+                if mode in ("full", "future"):
+                    events.extend(await self._discover_upcoming_events(since))
+                if mode in ("full", "historical"):
+                    events.extend(await self._discover_past_events(since))
         except Exception as e:
             logger.error(f"Error discovering events from UFC.com: {e}")
         
@@ -79,20 +260,12 @@ class UFCOfficialScraper:
         
         try:
             # Look for event cards or links
-            event_selectors = [
-                '.c-card-event',
-                '.event-card',
-                '.c-listing-fight',
-                'article.c-card',
-                '.view-events .views-row'
-            ]
-            
             event_elements = []
-            for selector in event_selectors:
-                elements = soup.select(selector)
+            for selector in _EVENT_CARD_SELECTORS:
+                elements = selector.select(soup)
                 if elements:
                     event_elements = elements
-                    logger.info(f"Found {len(elements)} events using selector: {selector}")
+                    logger.info(f"Found {len(elements)} events using selector: {selector.pattern}")
                     break
             
             if not event_elements:
@@ -108,11 +281,12 @@ class UFCOfficialScraper:
                     
                     event_id = href.split('/')[-1]
                     event_name = link.get_text(strip=True) or f"UFC Event {event_id}"
+                    event_date = datetime.now().strftime('%Y-%m-%d')  # Placeholder
                     
                     events.append({
                         'id': event_id,
                         'name': event_name,
-                        'date': datetime.now().strftime('%Y-%m-%d'),  # Placeholder
+                        'date': event_date,
                         'url': href,
                         'source': 'ufc_official'
                     })
@@ -144,7 +318,7 @@ class UFCOfficialScraper:
             event_name = event_link.get_text(strip=True)
             
             # Try to find date
-            date_elem = element.find(string=lambda text: text and any(month in text for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']))
+            date_elem = element.find(string=_MONTH_RE)
             event_date = datetime.now().strftime('%Y-%m-%d')  # Default
             
             if date_elem:
@@ -182,15 +356,15 @@ class UFCOfficialScraper:
             
             data = await self._fetch_json(self.EVENTS_API, params)
             
+            # Dates are YYYY-MM-DD, so they compare correctly as strings
+            since_date = _normalise_since(since)
+            
             for event_data in data.get('results', []):
                 event_info = self._parse_api_event(event_data)
                 if event_info:
                     # Filter by date if specified
-                    if since:
-                        event_date = datetime.strptime(event_info['date'], '%Y-%m-%d')
-                        since_date = datetime.strptime(since, '%Y-%m-%d')
-                        if event_date < since_date:
-                            continue
+                    if since_date and event_info['date'] < since_date:
+                        continue
                     
                     events.append(event_info)
             
@@ -211,8 +385,11 @@ class UFCOfficialScraper:
                 'status': 'past'
             }
             
-            # Paginate through past events
-            while True:
+            # Dates are YYYY-MM-DD, so they compare correctly as strings
+            since_date = _normalise_since(since)
+            
+            # Paginate through past events, newest first, up to MAX_API_PAGES pages
+            for _ in range(self.MAX_API_PAGES):
                 data = await self._fetch_json(self.EVENTS_API, params)
                 results = data.get('results', [])
                 
@@ -224,11 +401,8 @@ class UFCOfficialScraper:
                     event_info = self._parse_api_event(event_data)
                     if event_info:
                         # Filter by date if specified
-                        if since:
-                            event_date = datetime.strptime(event_info['date'], '%Y-%m-%d')
-                            since_date = datetime.strptime(since, '%Y-%m-%d')
-                            if event_date < since_date:
-                                continue
+                        if since_date and event_info['date'] < since_date:
+                            continue
                         
                         page_events.append(event_info)
                 
@@ -239,10 +413,6 @@ class UFCOfficialScraper:
                     break
                 
                 params['offset'] += params['limit']
-                
-                # Safety break
-                if params['offset'] > 1000:
-                    break
         
         except Exception as e:
             logger.error(f"Error discovering past events: {e}")
@@ -260,7 +430,10 @@ class UFCOfficialScraper:
             
             # Parse date
             date_str = event_data.get('date')
-            if date_str:
+            if date_str and _ISO_DATE_RE.match(date_str):
+                # API timestamps look like 2024-08-17T22:00:00Z; the date is the first 10 chars
+                event_date = date_str[:10]
+            elif date_str:
                 try:
                     event_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m-%d')
                 except ValueError:
@@ -295,24 +468,72 @@ class UFCOfficialScraper:
             return None
     
     async def scrape_event(self, event_id: str) -> Optional[UFCEvent]:
-        """Scrape detailed event information"""
+        """Scrape detailed event information, reusing a recent scrape of the same event"""
+        cached = self._cached_event(event_id)
+        if cached:
+            return cached
+        
         event_url = f"{self.BASE_URL}/event/{event_id}"
         
         try:
             soup = await self._fetch_page(event_url)
-            return await self._parse_event_details(soup, event_id, event_url)
+            event = await self._parse_event_details(soup, event_id, event_url)
+            if event:
+                self._cache_event(event_id, event)
+            return event
         except Exception as e:
             logger.error(f"Failed to scrape event {event_id}: {e}")
             return None
     
+    def _cached_event(self, event_id: str) -> Optional[UFCEvent]:
+        """A copy of a recent scrape of the event, if one is still fresh"""
+        cached = self._event_cache.get(event_id)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= self.EVENT_CACHE_TTL:
+            del self._event_cache[event_id]
+            return None
+        self._event_cache.move_to_end(event_id)
+        return cached[1].model_copy(deep=True)
+    
+    def _cache_event(self, event_id: str, event: UFCEvent):
+        """Remember a scraped event, dropping expired and least recently used entries"""
+        now = time.monotonic()
+        for expired_id in [key for key, (scraped_at, _) in self._event_cache.items()
+                           if now - scraped_at >= self.EVENT_CACHE_TTL]:
+            del self._event_cache[expired_id]
+        
+        self._event_cache[event_id] = (now, event.model_copy(deep=True))
+        self._event_cache.move_to_end(event_id)
+        while len(self._event_cache) > self.EVENT_CACHE_SIZE:
+            self._event_cache.popitem(last=False)
+    
+    async def scrape_events_bulk(self, event_ids: List[str],
+                                 concurrency: int = MAX_CONCURRENT_FETCHES) -> List[UFCEvent]:
+        """Scrape several events concurrently, at most `concurrency` at a time"""
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def guarded_scrape(event_id: str) -> Optional[UFCEvent]:
+            async with sem:
+                return await self.scrape_event(event_id)
+        
+        results = await asyncio.gather(*(guarded_scrape(event_id) for event_id in event_ids),
+                                       return_exceptions=True)
+        
+        events = []
+        for event_id, result in zip(event_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to scrape event {event_id}: {result}")
+            elif result:
+                events.append(result)
+        return events
+    
     async def _parse_event_details(self, soup: BeautifulSoup, event_id: str, event_url: str) -> Optional[UFCEvent]:
         """Parse event details from the event page"""
         try:
             # Extract event information
             event_name = self._extract_event_name(soup)
-            event_date = self._extract_event_date(soup)
-            venue = self._extract_venue(soup)
-            location = self._extract_location(soup)
+            event_date, venue, location = self._extract_hero_fields(soup)
             status = self._extract_status(soup)
             
             # Extract fights
@@ -337,83 +558,46 @@ class UFCOfficialScraper:
     
     def _extract_event_name(self, soup: BeautifulSoup) -> str:
         """Extract event name"""
-        # Try multiple selectors
-        selectors = [
-            'h1.hero-profile__name',
-            'h1.c-hero__headline',
-            '.event-header__title',
-            'h1'
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.text.strip()
+        # Try multiple lookups
+        elem = (soup.find('h1', class_='hero-profile__name')
+                or soup.find('h1', class_='c-hero__headline')
+                or soup.find(class_='event-header__title')
+                or soup.find('h1'))
+        if elem:
+            return elem.text.strip()
         
         return "Unknown Event"
     
-    def _extract_event_date(self, soup: BeautifulSoup) -> str:
-        """Extract event date"""
-        # Look for date in various formats
-        date_selectors = [
-            '.hero-profile__info .c-listing-fight__date',
-            '.c-hero__info .c-listing-fight__date',
-            '.event-header__date',
-            '[data-date]'
-        ]
-        
-        for selector in date_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                date_text = elem.text.strip()
-                try:
-                    # Try various date formats
-                    for fmt in ['%B %d, %Y', '%b %d, %Y', '%Y-%m-%d']:
-                        try:
-                            return datetime.strptime(date_text, fmt).strftime('%Y-%m-%d')
-                        except ValueError:
-                            continue
-                except:
-                    continue
+    def _extract_hero_fields(self, soup: BeautifulSoup) -> Tuple[str, Optional[str], Optional[str]]:
+        """Extract event date, venue and location, locating the hero info blocks only once"""
+        hero_infos = [info for info in (soup.find(class_=class_name) for class_name in _HERO_INFO_CLASSES) if info]
         
-        return datetime.now().strftime('%Y-%m-%d')
-    
-    def _extract_venue(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract venue information"""
-        venue_selectors = [
-            '.hero-profile__info .c-listing-fight__venue',
-            '.c-hero__info .c-listing-fight__venue',
-            '.event-header__venue'
-        ]
-        
-        for selector in venue_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.text.strip()
+        def candidates(field: str):
+            # Inside each hero info block first, then the standalone event header
+            for info in hero_infos:
+                yield info.find(class_=f'c-listing-fight__{field}')
+            yield soup.find(class_=f'event-header__{field}')
+            if field == 'date':
+                yield soup.find(attrs={'data-date': True})
         
-        return None
-    
-    def _extract_location(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract location information"""
-        location_selectors = [
-            '.hero-profile__info .c-listing-fight__location',
-            '.c-hero__info .c-listing-fight__location',
-            '.event-header__location'
-        ]
-        
-        for selector in location_selectors:
-            elem = soup.select_one(selector)
+        event_date = None
+        for elem in candidates('date'):
             if elem:
-                return elem.text.strip()
+                event_date = _parse_date_text(elem.text.strip())
+                if event_date:
+                    break
         
-        return None
+        venue = next((elem.text.strip() for elem in candidates('venue') if elem), None)
+        location = next((elem.text.strip() for elem in candidates('location') if elem), None)
+        
+        return event_date or datetime.now().strftime('%Y-%m-%d'), venue, location
     
     def _extract_status(self, soup: BeautifulSoup) -> EventStatus:
         """Extract event status"""
         # Check for indicators of event status
-        if soup.find(string=lambda text: text and 'upcoming' in text.lower()):
+        if soup.find(string=_UPCOMING_RE):
             return EventStatus.SCHEDULED
-        elif soup.find(string=lambda text: text and 'results' in text.lower()):
+        elif soup.find(string=_RESULTS_RE):
             return EventStatus.COMPLETED
         else:
             # Default to scheduled for UFC.com
@@ -423,6 +607,10 @@ class UFCOfficialScraper:
         """Extract fight information with segment detection"""
         fights = []
         
+        # Fighter-name and weight-class classes that matched earlier fights on this
+        # page; a page uses one markup variant throughout, so these are tried first
+        matched_classes: Dict[str, str] = {}
+        
         # Look for structured fight card sections
         segments = self._extract_fight_segments(soup)
         
@@ -430,7 +618,7 @@ class UFCOfficialScraper:
             bout_order = 1
             for segment_name, segment_fights in segments.items():
                 for fight_elem in segment_fights:
-                    fight = await self._parse_fight_element(fight_elem, bout_order)
+                    fight = await self._parse_fight_element(fight_elem, bout_order, matched_classes)
                     if fight:
                         # Add segment information to fight
                         fight.segment = segment_name
@@ -438,22 +626,16 @@ class UFCOfficialScraper:
                         bout_order += 1
         else:
             # Fallback to generic fight extraction
-            fight_selectors = [
-                '.l-listing__item',
-                '.c-listing-fight',
-                '.fight-card__fight'
-            ]
-            
             fight_elements = []
-            for selector in fight_selectors:
-                elements = soup.select(selector)
+            for class_name in _FIGHT_CLASSES:
+                elements = soup.find_all(class_=class_name)
                 if elements:
                     fight_elements = elements
                     break
             
             bout_order = 1
             for fight_elem in fight_elements:
-                fight = await self._parse_fight_element(fight_elem, bout_order)
+                fight = await self._parse_fight_element(fight_elem, bout_order, matched_classes)
                 if fight:
                     fights.append(fight)
                     bout_order += 1
@@ -469,100 +651,78 @@ class UFCOfficialScraper:
         """Extract fights organized by broadcast segments"""
         segments = {}
         
-        # Look for main card section
-        main_card_section = soup.find(id='main-card') or soup.find(class_='main-card')
-        if main_card_section:
-            main_card_fights = main_card_section.find_all(class_='c-listing-fight') or main_card_section.find_all('.l-listing__item')
-            if main_card_fights:
-                segments['main-card'] = main_card_fights
-        
-        # Look for prelims section
-        prelims_section = soup.find(id='prelims') or soup.find(class_='prelims')
-        if prelims_section:
-            prelims_fights = prelims_section.find_all(class_='c-listing-fight') or prelims_section.find_all('.l-listing__item')
-            if prelims_fights:
-                segments['prelims'] = prelims_fights
-        
-        # Look for early prelims section
-        early_prelims_section = soup.find(id='early-prelims') or soup.find(class_='early-prelims')
-        if early_prelims_section:
-            early_prelims_fights = early_prelims_section.find_all(class_='c-listing-fight') or early_prelims_section.find_all('.l-listing__item')
-            if early_prelims_fights:
-                segments['early-prelims'] = early_prelims_fights
+        # Find the main card, prelims and early prelims sections in one pass,
+        # preferring an id match over a class match for each segment
+        sections_by_id = {}
+        sections_by_class = {}
+        for section in soup.find_all(_is_segment_section):
+            section_id = section.get('id')
+            if section_id in FIGHT_SEGMENTS:
+                sections_by_id.setdefault(section_id, section)
+            for class_name in section.get('class', ()):
+                if class_name in FIGHT_SEGMENTS:
+                    sections_by_class.setdefault(class_name, section)
+        
+        for key in FIGHT_SEGMENTS:
+            section = sections_by_id.get(key) or sections_by_class.get(key)
+            if section:
+                section_fights = section.find_all(class_='c-listing-fight')
+                if section_fights:
+                    segments[key] = section_fights
         
         # Alternative: look for section headers
         if not segments:
-            sections_with_headers = {}
-            
-            # Find all potential section headers
-            headers = soup.find_all(['h2', 'h3', 'h4'], string=lambda text: text and any(keyword in text.lower() for keyword in ['main card', 'prelim']))
-            
-            for header in headers:
-                section_name = header.text.lower().strip()
-                if 'main card' in section_name:
-                    key = 'main-card'
-                elif 'early prelim' in section_name:
-                    key = 'early-prelims'
-                elif 'prelim' in section_name:
-                    key = 'prelims'
-                else:
-                    continue
-                
-                # Find fights after this header
-                current = header.next_sibling
-                section_fights = []
-                while current:
-                    if hasattr(current, 'find_all'):
-                        fights_in_current = current.find_all(class_='c-listing-fight') or current.find_all('.l-listing__item')
-                        section_fights.extend(fights_in_current)
-                    
-                    # Stop if we hit another header
-                    if hasattr(current, 'name') and current.name in ['h2', 'h3', 'h4']:
-                        break
-                    
-                    current = current.next_sibling
-                
-                if section_fights:
-                    sections_with_headers[key] = section_fights
-            
+            # Walk headers and fights together in document order, filing each fight
+            # under the section header it follows
+            header_sections = []
+            section_fights = None
+            for elem in soup.find_all(_is_header_or_fight):
+                if elem.name in _HEADER_TAGS:
+                    key = _header_segment(elem)
+                    section_fights = [] if key else None
+                    if key:
+                        header_sections.append((key, section_fights))
+                elif section_fights is not None:
+                    section_fights.append(elem)
+            
+            sections_with_headers = {key: fights for key, fights in header_sections if fights}
             segments = sections_with_headers
         
         return segments
     
-    async def _parse_fight_element(self, elem, bout_order: int) -> Optional[Fight]:
+    async def _parse_fight_element(self, elem, bout_order: int,
+                                   matched_classes: Optional[Dict[str, str]] = None) -> Optional[Fight]:
         """Parse individual fight element"""
+        if matched_classes is None:
+            matched_classes = {}
         try:
-            # Extract fighter names
-            fighter_names = []
-            
-            # Try different selectors for fighter names
-            name_selectors = [
-                '.c-listing-fight__corner-name',
-                '.c-listing-fight__fighter-name',
-                '.fight-card__fighter-name'
-            ]
-            
-            for selector in name_selectors:
-                names = elem.select(selector)
-                if names:
-                    fighter_names = [name.text.strip() for name in names]
-                    break
+            # Extract fighter names, trying the class that matched on this page before the full list
+            name_class = matched_classes.get('name')
+            names = elem.find_all(class_=name_class) if name_class else []
+            if not names:
+                for class_name in _FIGHTER_NAME_CLASSES:
+                    names = elem.find_all(class_=class_name)
+                    if names:
+                        matched_classes['name'] = class_name
+                        break
             
+            fighter_names = [name.text.strip() for name in names]
             if len(fighter_names) < 2:
                 return None
             
             # Extract weight class
             weight_class = "Unknown"
-            weight_selectors = [
-                '.c-listing-fight__class-text',
-                '.fight-card__weight-class'
-            ]
-            
-            for selector in weight_selectors:
-                weight_elem = elem.select_one(selector)
-                if weight_elem:
-                    weight_class = weight_elem.text.strip()
-                    break
+            weight_class_class = matched_classes.get('weight_class')
+            weight_elem = elem.find(class_=weight_class_class) if weight_class_class else None
+            if weight_elem is None:
+                for class_name in _WEIGHT_CLASS_CLASSES:
+                    weight_elem = elem.find(class_=class_name)
+                    if weight_elem:
+                        matched_classes['weight_class'] = class_name
+                        break
+            if weight_elem:
+                # Every card repeats a handful of weight classes; share one string per class
+                weight_class = sys.intern(weight_elem.text.strip())
             
             # Check for title fight
             title_fight = TitleFightType.NONE
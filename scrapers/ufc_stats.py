@@ -3,46 +3,233 @@ UFCStats.com scraper - Official UFC statistics website
 """
 
 import re
+import time
+import asyncio
 import logging
+from collections import deque
+from itertools import islice
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union, Callable
 from urllib.parse import urljoin, urlparse
-import requests
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
+import aiohttp
+import soupsieve as sv
+from bs4 import BeautifulSoup, FeatureNotFound
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
 from models.ufc_models import UFCEvent, Fight, Fighter, FighterRecord, EventStatus, TitleFightType
 from utils.rate_limiter import RateLimiter
+from utils.http_cache import HttpCache, cache_key, event_ttl
+from config import (USER_AGENT, UFCSTATS_BASE_URL, UFCSTATS_EVENTS_URL,
+                    HTTP_CACHE_TTL_HISTORICAL, HTTP_CACHE_TTL_FUTURE)
 
 logger = logging.getLogger(__name__)
 
+# "April 13, 2024" / "Apr 13, 2024" anywhere in a string, and the month numbers by abbreviation
+_DATE_RE = re.compile(
+    r'\b(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|'
+    r'Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+(\d{1,2}),\s*(\d{4})\b',
+    re.IGNORECASE
+)
+_MONTHS = {month: number for number, month in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+_MONTH_ABBR_RE = re.compile(r'Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec')
+_EVENT_HREF_RE = re.compile(r'/event-details/')
+
+# Event row selectors for the events listing page, most specific first, compiled once
+_EVENT_ROW_SELECTORS = [sv.compile(selector) for selector in (
+    'tr.b-statistics__table-row',
+    'tbody tr',
+    'table tr',
+    '.b-statistics__table tr'
+)]
+
+
+def _search_date(text: str) -> Optional[str]:
+    """Find a written-out date in text and return it as YYYY-MM-DD"""
+    match = _DATE_RE.search(text)
+    if not match:
+        return None
+    try:
+        return datetime(int(match[3]), _MONTHS[match[1][:3].lower()], int(match[2])).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a failed request is worth retrying (network trouble, throttling or a server error)"""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds a 429 response asked us to wait, if it said"""
+    if isinstance(exc, aiohttp.ClientResponseError) and exc.status == 429 and exc.headers:
+        value = exc.headers.get('Retry-After', '').strip()
+        if value.isdigit():
+            return float(value)
+    return None
+
+
+def _parse_html(content: bytes) -> BeautifulSoup:
+    """Parse a page with lxml, falling back to the stdlib parser"""
+    try:
+        return BeautifulSoup(content, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(content, 'html.parser')
+
 
 class UFCStatsScaper:
     """Scraper for UFCStats.com"""
     
-    BASE_URL = "http://ufcstats.com"
-    EVENTS_URL = f"{BASE_URL}/statistics/events/completed"
+    BASE_URL = UFCSTATS_BASE_URL
+    EVENTS_URL = UFCSTATS_EVENTS_URL
+    
+    HEADERS = {
+        'User-Agent': USER_AGENT
+    }
+    
+    # Pages fetched at once by scrape_events_bulk, and the per-host connection pool size
+    MAX_CONCURRENT_FETCHES = 10
+    
+    # Request hedging: UFCStats sometimes stalls on one page for 20-30s, so a page that
+    # is much slower than usual gets a second, duplicate request and the first reply wins
+    HEDGE_DELAY = 2.0                # seconds before hedging, until latencies are known
+    HEDGE_MIN_DELAY = 0.5            # never hedge sooner than this
+    HEDGE_LATENCY_MULTIPLIER = 3.0   # hedge once a request takes this many times the average
+    MAX_HEDGES_PER_MINUTE = 5        # cap on the extra load put on ufcstats.com
+    
+    # Longest Retry-After we honour on a 429 before the next attempt
+    MAX_RETRY_AFTER = 60.0
     
-    def __init__(self, rate_limiter: RateLimiter):
+    def __init__(self, rate_limiter: RateLimiter, http_cache: Optional[HttpCache] = None):
         self.rate_limiter = rate_limiter
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.http_cache = http_cache
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Moving average of page fetch latency, and when recent hedges were sent
+        self._latency_ema: Optional[float] = None
+        self._hedge_times: deque = deque()
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the HTTP session on first use, inside the running event loop"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.MAX_CONCURRENT_FETCHES,
+                                               ttl_dns_cache=300, keepalive_timeout=30),
+                headers=self.HEADERS,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def _fetch_page(self, url: str) -> BeautifulSoup:
-        """Fetch and parse a web page with retry logic"""
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10),
+           retry=retry_if_exception(_is_transient), reraise=True)
+    async def _fetch_page(self, url: str,
+                          ttl: Union[float, Callable[[BeautifulSoup], float]] = HTTP_CACHE_TTL_FUTURE) -> BeautifulSoup:
+        """Fetch and parse a web page with retry logic, served from the HTTP cache when fresh"""
+        key = cache_key(url)
+        cached = self.http_cache.get(key) if self.http_cache else None
+        cached_soup = None
+        if cached and not callable(ttl):
+            if cached.is_fresh(ttl):
+                return _parse_html(cached.body)
+        elif cached:
+            # `ttl` is worked out from the cached page itself (e.g. an event's date) and lies
+            # between the short and long TTLs; only parse the page when those don't settle it
+            if cached.is_fresh(HTTP_CACHE_TTL_FUTURE):
+                return _parse_html(cached.body)
+            if cached.is_fresh(HTTP_CACHE_TTL_HISTORICAL):
+                cached_soup = _parse_html(cached.body)
+                if cached.is_fresh(ttl(cached_soup)):
+                    return cached_soup
+        
         await self.rate_limiter.wait()
         
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            headers = cached.conditional_headers() if cached else None
+            status, content, response_headers = await self._fetch_hedged(url, headers)
+            if cached and status == 304:
+                self.http_cache.touch(key)
+                return cached_soup if cached_soup is not None else _parse_html(cached.body)
+            if self.http_cache:
+                self.http_cache.put(key, content, response_headers.get('ETag'),
+                                    response_headers.get('Last-Modified'))
+            return _parse_html(content)
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
+            retry_after = _retry_after(e)
+            if retry_after is not None:
+                # Throttled: hold back every request sharing the rate limiter, not just this one
+                self.rate_limiter.pause(min(retry_after, self.MAX_RETRY_AFTER))
             raise
     
+    async def _fetch_body(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Any]:
+        """Download a page, returning its status, body and response headers"""
+        async with self._ensure_session().get(url, headers=headers) as response:
+            response.raise_for_status()
+            return response.status, await response.read(), response.headers
+    
+    async def _fetch_hedged(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Any]:
+        """Download a page, sending a hedge request if the first one is unusually slow"""
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(self._fetch_body(url, headers))]
+        
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay())
+            if not done and self._take_hedge_slot():
+                await self.rate_limiter.wait()
+                if tasks[0].done():
+                    # The original finished while the hedge waited for the rate limiter
+                    self._hedge_times.pop()
+                else:
+                    logger.debug(f"Hedging slow request for {url}")
+                    tasks.append(asyncio.ensure_future(self._fetch_body(url, headers)))
+            
+            # Return the first successful reply; a failure only counts once both have failed
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._record_latency(time.monotonic() - started)
+                        return task.result()
+            raise tasks[0].exception()
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()  # mark a losing failure as handled
+                else:
+                    task.cancel()
+    
+    def _hedge_delay(self) -> float:
+        """How long to wait on a request before hedging it"""
+        if self._latency_ema is None:
+            return self.HEDGE_DELAY
+        return max(self.HEDGE_MIN_DELAY, self._latency_ema * self.HEDGE_LATENCY_MULTIPLIER)
+    
+    def _record_latency(self, latency: float):
+        """Fold a successful fetch's latency into the moving average"""
+        if self._latency_ema is None:
+            self._latency_ema = latency
+        else:
+            self._latency_ema = 0.8 * self._latency_ema + 0.2 * latency
+    
+    def _take_hedge_slot(self) -> bool:
+        """Claim one of the hedges allowed per minute, if any are left"""
+        now = time.monotonic()
+        while self._hedge_times and now - self._hedge_times[0] > 60:
+            self._hedge_times.popleft()
+        if len(self._hedge_times) >= self.MAX_HEDGES_PER_MINUTE:
+            return False
+        self._hedge_times.append(now)
+        return True
+    
     async def discover_events(self, mode: str = "full", since: Optional[str] = None) -> List[Dict]:
         """Discover UFC events from UFCStats.com"""
         events = []
@@ -62,44 +249,33 @@ class UFCStatsScaper:
             # Start with the main events page
             soup = await self._fetch_page(self.EVENTS_URL)
             
-            # Look for different possible selectors for event rows
+            # Look for different possible selectors for event rows; the first matches on the
+            # current site, the rest only run if its markup changes
             event_rows = []
-            
-            # Try multiple selectors
-            selectors = [
-                'tr.b-statistics__table-row',
-                'tbody tr',
-                'table tr',
-                '.b-statistics__table tr'
-            ]
-            
-            for selector in selectors:
-                rows = soup.select(selector)
+            for selector in _EVENT_ROW_SELECTORS:
+                rows = selector.select(soup)
                 if rows and len(rows) > 1:  # Skip header row
                     event_rows = rows[1:]  # Skip header
-                    logger.info(f"Found {len(event_rows)} event rows using selector: {selector}")
+                    logger.info(f"Found {len(event_rows)} event rows using selector: {selector.pattern}")
                     break
             
             if not event_rows:
                 logger.warning("No event rows found. Checking page structure...")
-                # Debug: show some page content
-                text_content = soup.get_text()[:500]
+                # Debug: show some page content, reading only as much of the page as the preview needs
+                text_content = ' '.join(islice(soup.stripped_strings, 50))[:500]
                 logger.info(f"Page content preview: {text_content}")
                 return events
             
+            # Zero-padded YYYY-MM-DD strings compare in date order
+            since_date = datetime.strptime(since, '%Y-%m-%d').strftime('%Y-%m-%d') if since else None
+            
             for row in event_rows[:20]:  # Limit to first 20 events for testing
                 event_data = self._parse_event_row(row)
                 if event_data:
-                    # Filter by date if specified
-                    if since:
-                        try:
-                            event_date = datetime.strptime(event_data['date'], '%Y-%m-%d')
-                            since_date = datetime.strptime(since, '%Y-%m-%d')
-                            if event_date < since_date:
-                                continue
-                        except ValueError:
-                            logger.warning(f"Could not parse date: {event_data.get('date')}")
-                            continue
+                    # Filter by date if specified; events are listed newest first, so
+                    # the first one before `since` means the rest are older too
+                    if since_date and event_data['date'] < since_date:
+                        break
                     
                     events.append(event_data)
                     logger.info(f"Found event: {event_data['name']} on {event_data['date']}")
@@ -120,56 +296,24 @@ class UFCStatsScaper:
             if len(cols) < 2:
                 return None
             
-            # Find event link - could be in first or second column
-            event_link = None
-            event_name = ""
-            
-            for col in cols[:3]:  # Check first 3 columns
-                link = col.find('a', href=True)
-                if link and '/event-details/' in link.get('href', ''):
-                    event_link = link
-                    event_name = link.text.strip()
-                    break
-            
-            if not event_link:
-                return None
+            # UFCStats layout: event link and date in the first cell, location in the second
+            event_link = cols[0].find('a', href=_EVENT_HREF_RE)
+            event_date = _search_date(cols[0].get_text(' ')) if event_link else None
+            if event_link and event_date:
+                event_name = event_link.text.strip()
+                location = cols[1].text.strip()
+            else:
+                logger.debug("Event row does not match the UFCStats layout, scanning its columns")
+                event_link, event_name, event_date, location = self._scan_event_row(cols)
+                if not event_link:
+                    return None
             
             event_url = urljoin(self.BASE_URL, event_link.get('href'))
             
-            # Extract date - look for date patterns in all columns
-            event_date = None
-            for col in cols:
-                text = col.text.strip()
-                if text and any(month in text for month in ['January', 'February', 'March', 'April', 'May', 'June', 
-                                                           'July', 'August', 'September', 'October', 'November', 'December',
-                                                           'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                                                           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
-                    try:
-                        # Try different date formats
-                        for fmt in ['%B %d, %Y', '%b %d, %Y', '%m/%d/%Y']:
-                            try:
-                                event_date = datetime.strptime(text, fmt).strftime('%Y-%m-%d')
-                                break
-                            except ValueError:
-                                continue
-                        if event_date:
-                            break
-                    except:
-                        continue
-            
             # If no date found, use a default recent date for testing
             if not event_date:
                 event_date = datetime.now().strftime('%Y-%m-%d')
             
-            # Extract location
-            location = ""
-            for col in cols:
-                text = col.text.strip()
-                if text and text != event_name and not any(month in text for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
-                    if len(text) > 3 and ',' in text:  # Likely a location
-                        location = text
-                        break
-            
             # Generate event ID from URL
             event_id = event_url.split('/')[-1] if event_url else f"event-{hash(event_name)}"
             
@@ -186,25 +330,86 @@ class UFCStatsScaper:
             logger.error(f"Error parsing event row: {e}")
             return None
     
+    def _scan_event_row(self, cols) -> Tuple[Optional[Any], str, Optional[str], str]:
+        """Find the event link, name, date and location in a row with an unexpected layout"""
+        # Find event link - could be in first or second column
+        event_link = None
+        event_name = ""
+        
+        for col in cols[:3]:  # Check first 3 columns
+            link = col.find('a', href=_EVENT_HREF_RE)
+            if link:
+                event_link = link
+                event_name = link.text.strip()
+                break
+        
+        if not event_link:
+            return None, event_name, None, ""
+        
+        # Cell texts are reused by the date and location scans below
+        col_texts = [col.get_text(' ').strip() for col in cols]
+        
+        # Extract date - look for date patterns in all columns
+        event_date = None
+        for text in col_texts:
+            event_date = _search_date(text)
+            if event_date:
+                break
+        
+        # Extract location
+        location = ""
+        for text in col_texts:
+            if text and text != event_name and not _MONTH_ABBR_RE.search(text):
+                if len(text) > 3 and ',' in text:  # Likely a location
+                    location = text
+                    break
+        
+        return event_link, event_name, event_date, location
+    
     async def scrape_event(self, event_id: str) -> Optional[UFCEvent]:
         """Scrape detailed event information"""
         event_url = f"{self.BASE_URL}/event-details/{event_id}"
         
         try:
-            soup = await self._fetch_page(event_url)
+            soup = await self._fetch_page(event_url, ttl=self._event_page_ttl)
             return await self._parse_event_details(soup, event_id, event_url)
         except Exception as e:
             logger.error(f"Failed to scrape event {event_id}: {e}")
             return None
     
+    def _event_page_ttl(self, soup: BeautifulSoup) -> float:
+        """Cache lifetime for an event page: long once the event is over, short otherwise"""
+        # The events index also lists the next upcoming event, whose page will still change
+        event_date, _ = self._extract_event_info(soup)
+        return event_ttl(event_date)
+    
+    async def scrape_events_bulk(self, event_ids: List[str],
+                                 concurrency: int = MAX_CONCURRENT_FETCHES) -> List[UFCEvent]:
+        """Scrape several events concurrently, at most `concurrency` at a time"""
+        sem = asyncio.BoundedSemaphore(concurrency)
+        
+        async def guarded_scrape(event_id: str) -> Optional[UFCEvent]:
+            async with sem:
+                return await self.scrape_event(event_id)
+        
+        results = await asyncio.gather(*(guarded_scrape(event_id) for event_id in event_ids),
+                                       return_exceptions=True)
+        
+        events = []
+        for event_id, result in zip(event_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to scrape event {event_id}: {result}")
+            elif result:
+                events.append(result)
+        return events
+    
     async def _parse_event_details(self, soup: BeautifulSoup, event_id: str, event_url: str) -> Optional[UFCEvent]:
         """Parse event details from the event page"""
         try:
             # Extract event header information
             event_name = self._extract_event_name(soup)
-            event_date = self._extract_event_date(soup)
-            venue = self._extract_venue(soup)
-            location = self._extract_location(soup)
+            event_date, location = self._extract_event_info(soup)
+            venue = location  # UFCStats gives one "Location:" line for both
             
             # Extract fights
             fights = await self._extract_fights(soup)
@@ -242,36 +447,21 @@ class UFCStatsScaper:
         
         return "Unknown Event"
     
-    def _extract_event_date(self, soup: BeautifulSoup) -> str:
-        """Extract event date"""
-        # Look for date in event details
-        details = soup.find_all('li', class_='b-list__box-list-item')
-        for detail in details:
-            text = detail.text.strip()
-            if 'Date:' in text:
-                date_text = text.replace('Date:', '').strip()
-                try:
-                    return datetime.strptime(date_text, '%B %d, %Y').strftime('%Y-%m-%d')
-                except ValueError:
-                    try:
-                        return datetime.strptime(date_text, '%b %d, %Y').strftime('%Y-%m-%d')
-                    except ValueError:
-                        pass
-        
-        return datetime.now().strftime('%Y-%m-%d')
-    
-    def _extract_venue(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract venue information"""
-        details = soup.find_all('li', class_='b-list__box-list-item')
-        for detail in details:
+    def _extract_event_info(self, soup: BeautifulSoup) -> Tuple[str, Optional[str]]:
+        """Extract the event date and location from the details list in one pass"""
+        event_date = None
+        location = None
+        
+        for detail in soup.find_all('li', class_='b-list__box-list-item'):
             text = detail.text.strip()
-            if 'Location:' in text:
-                return text.replace('Location:', '').strip()
-        return None
-    
-    def _extract_location(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract location (same as venue for UFCStats)"""
-        return self._extract_venue(soup)
+            if event_date is None and 'Date:' in text:
+                event_date = _search_date(text)
+            if location is None and 'Location:' in text:
+                location = text.replace('Location:', '').strip()
+            if event_date and location is not None:
+                break
+        
+        return event_date or datetime.now().strftime('%Y-%m-%d'), location
     
     async def _extract_fights(self, soup: BeautifulSoup) -> List[Fight]:
         """Extract fight information from event page"""
@@ -430,9 +620,10 @@ class UFCStatsScaper:
                 try:
                     test_url = f"{self.BASE_URL}/fighter-details/{variant}"
                     # Test if URL exists by making a head request
-                    response = self.session.head(test_url, timeout=10)
-                    if response.status_code == 200:
-                        return test_url
+                    async with self._ensure_session().head(
+                            test_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                        if response.status == 200:
+                            return test_url
                 except:
                     continue
             
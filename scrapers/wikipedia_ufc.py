@@ -3,6 +3,7 @@ Wikipedia UFC scraper - Much more reliable and structured data
 """
 
 import re
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional, Dict, Any
@@ -14,7 +15,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from models.ufc_models import UFCEvent, Fight, Fighter, FighterRecord, EventStatus, TitleFightType
 from utils.rate_limiter import RateLimiter
 from scrapers.fighter_database import build_fighter_database
-import json
+from config import FIGHTERS_CACHE_FILENAME
+import orjson
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -34,8 +36,9 @@ class WikipediaUFCScraper:
         'UFC_on_Fuel_TV:_Sanchez_vs._Ellenberger': '2012-02-15'
     }
     
-    def __init__(self, rate_limiter: RateLimiter):
+    def __init__(self, rate_limiter: RateLimiter, output_dir: str = "data"):
         self.rate_limiter = rate_limiter
+        self.output_dir = Path(output_dir)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'UFC-Scraper/1.0 (Educational/Research Purpose)'
@@ -43,19 +46,27 @@ class WikipediaUFCScraper:
         # Initialize fighter database
         self.fighter_database = None
         self._database_loaded = False
+        self._database_lock = asyncio.Lock()
     
     async def _load_fighter_database(self):
         """Load fighter database from file or build it"""
         if self._database_loaded:
             return
         
+        # Concurrent event scrapes all arrive here; only the first one loads (or
+        # builds) the database, the rest wait for it
+        async with self._database_lock:
+            if not self._database_loaded:
+                await self._read_or_build_fighter_database()
+    
+    async def _read_or_build_fighter_database(self):
+        """Read the fighter database file, building the database if there is none"""
         database_file = Path('data/fighter_database.json')
         
         try:
             # Try to load existing database
             if database_file.exists():
-                with open(database_file, 'r') as f:
-                    fighters_data = json.load(f)
+                fighters_data = orjson.loads(database_file.read_bytes())
                 
                 # Convert to Fighter objects
                 self.fighter_database = {}
@@ -68,7 +79,7 @@ class WikipediaUFCScraper:
             else:
                 logger.info("No existing fighter database found, building new one...")
                 # Build database from scratch
-                fighters_dict = await build_fighter_database()
+                fighters_dict = await build_fighter_database(self.output_dir / FIGHTERS_CACHE_FILENAME)
                 self.fighter_database = {name.lower(): fighter for name, fighter in fighters_dict.items()}
                 logger.info(f"Built fighter database with {len(self.fighter_database)} fighters")
             
@@ -207,7 +218,7 @@ class WikipediaUFCScraper:
             # --- Extract Date ---
             date_cell = cells[date_col]
             date_text = date_cell.get_text(strip=True)
-            event_date = self._parse_date_from_text(date_text)
+            event_date = self._parse_date_from_text(date_text) or datetime.now().strftime('%Y-%m-%d')
             
             # --- Extract Venue and Location ---
             venue = cells[venue_col].get_text(strip=True)
@@ -216,7 +227,7 @@ class WikipediaUFCScraper:
             return {
                 'id': event_id,
                 'name': event_name,
-                'date': event_date or datetime.now().strftime('%Y-%m-%d'),
+                'date': event_date,
                 'venue': venue,
                 'location': location,
                 'url': event_url,
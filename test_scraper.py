@@ -13,6 +13,7 @@ try:
     from models.ufc_models import UFCEvent, Fight, Fighter, EventStatus, TitleFightType
     from utils.rate_limiter import RateLimiter
     from utils.database import DatabaseManager
+    from utils.http_cache import HttpCache, cache_key
     from scrapers.ufc_stats import UFCStatsScaper
     from scrapers.ufc_official import UFCOfficialScraper
     from scrapers.espn_mma import ESPNMMAScraper
@@ -183,6 +184,55 @@ async def test_scrapers():
     return True
 
 
+async def test_event_page_parsing():
+    """Test UFC.com event page parsing without hero or listing wrappers"""
+    print("\n=== Testing Event Page Parsing ===")
+    
+    # Segments marked by section ids, then by plain headers alone
+    fixture = """<html><body>
+        <h1>UFC 999: Fixture vs. Test</h1>
+        <div data-date="2024-04-13">April 13, 2024</div>
+        <p>Results</p>
+        <section{main_card}><h2>Main Card</h2>
+            <div class="c-listing-fight"><span class="c-listing-fight__corner-name">Fighter A</span>
+                <span class="c-listing-fight__corner-name">Fighter B</span></div>
+        </section>
+        <section{prelims}><h2>Prelims</h2>
+            <div class="c-listing-fight"><span class="c-listing-fight__corner-name">Fighter C</span>
+                <span class="c-listing-fight__corner-name">Fighter D</span></div>
+        </section>
+    </body></html>"""
+    
+    cache_path = "test_http_cache.db"
+    http_cache = HttpCache(cache_path)
+    try:
+        # Served from the cache, so nothing is fetched from UFC.com
+        ufc_official = UFCOfficialScraper(RateLimiter(requests_per_second=10.0), http_cache)
+        for event_id, section_ids in (("by-id", (' id="main-card"', ' id="prelims"')), ("by-header", ('', ''))):
+            page = fixture.format(main_card=section_ids[0], prelims=section_ids[1])
+            http_cache.put(cache_key(f"{ufc_official.BASE_URL}/event/{event_id}"), page.encode())
+            event = await ufc_official.scrape_event(event_id)
+            
+            assert event is not None, "event page did not parse"
+            assert event.event_name == "UFC 999: Fixture vs. Test", event.event_name
+            assert event.event_date == "2024-04-13", event.event_date
+            assert event.status == EventStatus.COMPLETED, event.status
+            segments = {fight.fighter1.name: fight.segment for fight in event.fights}
+            assert segments == {"Fighter A": "main-card", "Fighter C": "prelims"}, segments
+            print(f"✓ Event page parsed ({event_id}): {len(event.fights)} fights with segments")
+        
+        await ufc_official.close()
+        
+    except Exception as e:
+        print(f"✗ Event page parsing test failed: {e}")
+        return False
+    finally:
+        http_cache.close()
+        Path(cache_path).unlink(missing_ok=True)
+    
+    return True
+
+
 def test_config():
     """Test configuration"""
     print("\n=== Testing Configuration ===")
@@ -257,6 +307,7 @@ async def main():
         ("Rate Limiter", test_rate_limiter),
         ("Database", test_database),
         ("Scrapers", test_scrapers),
+        ("Event Page Parsing", test_event_page_parsing),
     ]
     
     passed = 0
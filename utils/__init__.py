@@ -4,5 +4,6 @@ Utilities package for UFC scraper
 
 from .rate_limiter import RateLimiter
 from .database import DatabaseManager
+from .http_cache import HttpCache
 
-__all__ = ['RateLimiter', 'DatabaseManager']
\ No newline at end of file
+__all__ = ['RateLimiter', 'DatabaseManager', 'HttpCache']
\ No newline at end of file
@@ -27,6 +27,9 @@ class DatabaseManager:
         try:
             self.connection = sqlite3.connect(str(self.db_path))
             self.connection.row_factory = sqlite3.Row
+            # WAL + NORMAL sync: commits no longer fsync the main database file
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
             logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
@@ -104,76 +107,94 @@ class DatabaseManager:
             logger.error(f"Failed to create database tables: {e}")
             raise
     
+    EVENT_INSERT_SQL = """
+        INSERT OR REPLACE INTO events (
+            event_id, event_name, event_date, venue, location, status,
+            attendance, gate, tv_broadcast, start_time, scraped_at, source_urls
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    FIGHT_INSERT_SQL = """
+        INSERT INTO fights (
+            event_id, bout_order, fighter1_name, fighter2_name,
+            fighter1_record, fighter2_record, fighter1_rank, fighter2_rank,
+            fighter1_country, fighter2_country, weight_class, title_fight,
+            method, round, time, winner, result, referee, bonuses,
+            odds, stats, fight_url
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _event_row(self, event: UFCEvent) -> tuple:
+        """Build the events table row for an event"""
+        return (
+            event.event_id,
+            event.event_name,
+            event.event_date,
+            event.venue,
+            event.location,
+            event.status.value,
+            event.attendance,
+            event.gate,
+            event.tv_broadcast,
+            event.start_time,
+            event.scraped_at.isoformat(),
+            json.dumps(event.source_urls)
+        )
+    
+    def _fight_rows(self, event: UFCEvent) -> List[tuple]:
+        """Build the fights table rows for an event"""
+        return [(
+            event.event_id,
+            fight.bout_order,
+            fight.fighter1.name,
+            fight.fighter2.name,
+            fight.fighter1.record,
+            fight.fighter2.record,
+            fight.fighter1.rank,
+            fight.fighter2.rank,
+            fight.fighter1.country,
+            fight.fighter2.country,
+            fight.weight_class,
+            fight.title_fight.value,
+            fight.method,
+            fight.round,
+            fight.time,
+            fight.winner,
+            fight.result.value if fight.result else None,
+            fight.referee,
+            json.dumps(fight.bonuses) if fight.bonuses else None,
+            fight.odds.model_dump_json() if fight.odds else None,
+            fight.stats.model_dump_json() if fight.stats else None,
+            fight.fight_url
+        ) for fight in event.fights]
+    
     def save_event(self, event: UFCEvent) -> bool:
         """Save event and its fights to database"""
+        return self.save_events([event])
+    
+    def save_events(self, events: List[UFCEvent]) -> bool:
+        """Save events and their fights to database in a single transaction"""
         try:
-            cursor = self.connection.cursor()
+            event_rows = [self._event_row(event) for event in events]
+            fight_rows = [row for event in events for row in self._fight_rows(event)]
             
-            # Insert/update event
-            cursor.execute("""
-                INSERT OR REPLACE INTO events (
-                    event_id, event_name, event_date, venue, location, status,
-                    attendance, gate, tv_broadcast, start_time, scraped_at, source_urls
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                event.event_id,
-                event.event_name,
-                event.event_date,
-                event.venue,
-                event.location,
-                event.status.value,
-                event.attendance,
-                event.gate,
-                event.tv_broadcast,
-                event.start_time,
-                event.scraped_at.isoformat(),
-                json.dumps(event.source_urls)
-            ))
+            cursor = self.connection.cursor()
             
-            # Delete existing fights for this event
-            cursor.execute("DELETE FROM fights WHERE event_id = ?", (event.event_id,))
+            # Insert/update events
+            cursor.executemany(self.EVENT_INSERT_SQL, event_rows)
             
-            # Insert fights
-            for fight in event.fights:
-                cursor.execute("""
-                    INSERT INTO fights (
-                        event_id, bout_order, fighter1_name, fighter2_name,
-                        fighter1_record, fighter2_record, fighter1_rank, fighter2_rank,
-                        fighter1_country, fighter2_country, weight_class, title_fight,
-                        method, round, time, winner, result, referee, bonuses,
-                        odds, stats, fight_url
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    event.event_id,
-                    fight.bout_order,
-                    fight.fighter1.name,
-                    fight.fighter2.name,
-                    fight.fighter1.record,
-                    fight.fighter2.record,
-                    fight.fighter1.rank,
-                    fight.fighter2.rank,
-                    fight.fighter1.country,
-                    fight.fighter2.country,
-                    fight.weight_class,
-                    fight.title_fight.value,
-                    fight.method,
-                    fight.round,
-                    fight.time,
-                    fight.winner,
-                    fight.result.value if fight.result else None,
-                    fight.referee,
-                    json.dumps(fight.bonuses) if fight.bonuses else None,
-                    fight.odds.model_dump_json() if fight.odds else None,
-                    fight.stats.model_dump_json() if fight.stats else None,
-                    fight.fight_url
-                ))
+            # Replace existing fights for these events
+            cursor.executemany("DELETE FROM fights WHERE event_id = ?",
+                               [(event.event_id,) for event in events])
+            cursor.executemany(self.FIGHT_INSERT_SQL, fight_rows)
             
             self.connection.commit()
-            logger.info(f"Saved event {event.event_id} with {len(event.fights)} fights")
+            logger.info(f"Saved {len(events)} events with {len(fight_rows)} fights")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to save event {event.event_id}: {e}")
+            event_ids = ', '.join(event.event_id for event in events)
+            logger.error(f"Failed to save events {event_ids}: {e}")
             self.connection.rollback()
             return False
     
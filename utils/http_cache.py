@@ -0,0 +1,108 @@
+"""
+Persistent HTTP response cache for UFC scraper
+"""
+
+import sqlite3
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from config import HTTP_CACHE_TTL_HISTORICAL, HTTP_CACHE_TTL_FUTURE, HTTP_CACHE_SETTLE_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    """A stored response body with its validators"""
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Whether the response can be used without revalidating"""
+        return self.fetched_at + ttl > time.time()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional request against this response"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Build the cache key for a request URL and its query parameters"""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def event_ttl(event_date: Optional[str]) -> float:
+    """Cache lifetime for an event page given its date (YYYY-MM-DD)"""
+    # Results and closing odds land on fight night and may be corrected the day
+    # after, so an event only counts as finished once it is a couple of days old
+    try:
+        event_day = datetime.strptime(event_date, '%Y-%m-%d')
+        if event_day + timedelta(days=HTTP_CACHE_SETTLE_DAYS) < datetime.now():
+            return HTTP_CACHE_TTL_HISTORICAL
+    except (TypeError, ValueError):
+        pass
+    return HTTP_CACHE_TTL_FUTURE
+
+
+class HttpCache:
+    """SQLite-backed store of HTTP responses keyed by URL"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = Path(cache_path)
+        self.connection = sqlite3.connect(str(self.cache_path))
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for a URL, if any"""
+        row = self.connection.execute(
+            "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        """Store a freshly fetched response"""
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, time.time())
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to cache response for {url}: {e}")
+
+    def touch(self, url: str):
+        """Mark a cached response as revalidated now (after a 304)"""
+        try:
+            self.connection.execute(
+                "UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to refresh cached response for {url}: {e}")
+
+    def close(self):
+        """Close the cache database"""
+        self.connection.close()
@@ -4,7 +4,7 @@ Rate limiter utility for polite web scraping
 
 import asyncio
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 
 class RateLimiter:
@@ -19,19 +19,44 @@ class RateLimiter:
         """
         self.requests_per_second = requests_per_second
         self.min_interval = 1.0 / requests_per_second
-        self.last_request_time: Optional[float] = None
+        self.next_request_time: Optional[float] = None
+        
+        # Slots claimed by callers that were cancelled while waiting: slot end -> slot start
+        self._cancelled_slots: Dict[float, float] = {}
     
     async def wait(self):
         """Wait if necessary to respect rate limit"""
-        current_time = time.time()
+        current_time = time.monotonic()
+        
+        # Claim the next free slot before sleeping, so concurrent callers are
+        # spaced min_interval apart instead of all waking up together
+        slot = current_time
+        if self.next_request_time is not None:
+            slot = max(current_time, self.next_request_time)
+        self.next_request_time = slot + self.min_interval
         
-        if self.last_request_time is not None:
-            time_since_last = current_time - self.last_request_time
-            if time_since_last < self.min_interval:
-                sleep_time = self.min_interval - time_since_last
-                await asyncio.sleep(sleep_time)
+        if slot > current_time:
+            try:
+                await asyncio.sleep(slot - current_time)
+            except asyncio.CancelledError:
+                self._release(slot)
+                raise
+    
+    def _release(self, slot: float):
+        """Give back the slot of a caller that was cancelled before sending its request"""
+        now = time.monotonic()
+        self._cancelled_slots = {end: start for end, start in self._cancelled_slots.items() if end > now}
+        self._cancelled_slots[slot + self.min_interval] = slot
         
-        self.last_request_time = time.time()
+        # Roll the queue back over trailing slots nobody is waiting for any more
+        while self.next_request_time in self._cancelled_slots:
+            self.next_request_time = self._cancelled_slots.pop(self.next_request_time)
+    
+    def pause(self, seconds: float):
+        """Hold back every caller for at least `seconds` (e.g. after a 429)"""
+        resume_time = time.monotonic() + seconds
+        if self.next_request_time is None or self.next_request_time < resume_time:
+            self.next_request_time = resume_time
     
     def set_rate(self, requests_per_second: float):
         """Update the rate limit"""
@@ -12,6 +12,9 @@ import http.server
 import socketserver
 from urllib.parse import urlparse, parse_qs
 
+import orjson
+
+from config import dump_json
 from models.ufc_models import UFCEvent
 
 
@@ -107,15 +110,15 @@ class UFCDataHandler(http.server.SimpleHTTPRequestHandler):
     
     def send_json_response(self, data):
         """Send JSON response with proper headers"""
-        json_data = json.dumps(data, indent=2, ensure_ascii=False)
+        json_data = orjson.dumps(data, option=orjson.OPT_INDENT_2)
         
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Content-Length', len(json_data.encode('utf-8')))
+        self.send_header('Content-Length', len(json_data))
         self.end_headers()
         
-        self.wfile.write(json_data.encode('utf-8'))
+        self.wfile.write(json_data)
     
     def log_message(self, format, *args):
         """Override to customize logging"""
@@ -201,8 +204,7 @@ def create_sample_events():
     # Save sample events
     for event in sample_events:
         filename = f"{event['event_id']}.json"
-        with open(data_dir / filename, 'w', encoding='utf-8') as f:
-            json.dump(event, f, indent=2, ensure_ascii=False)
+        dump_json(event, data_dir / filename)
     
     print(f"Created {len(sample_events)} sample events in {data_dir}")
 